@@ -2,14 +2,43 @@ import hashlib
 import hmac
 import json
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 
 import numpy as np
+import orjson
 import requests
 from config_managers import IConfigManager
 from lazop import LazopClient, LazopRequest
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_http_session() -> requests.Session:
+    """Create a pooled keep-alive session with retry on transient errors"""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                          max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "omni-ecommerce-backend"
+    return session
+
+
+def _json_default(value):
+    """Fallback for orjson: numpy scalars to int/float, anything else to str"""
+    if isinstance(value, (np.int32, np.int64)):
+        return int(value)
+    if isinstance(value, (np.float32, np.float64)):
+        return float(value)
+    return str(value)
 
 
 class IAPIClient(ABC):
@@ -30,6 +59,8 @@ class ShopeeAPIClient(IAPIClient):
     def __init__(self, config_manager: IConfigManager):
         self.config = config_manager
         self.base_url = "https://partner.shopeemobile.com"
+        self.session = create_http_session()
+        self._token_lock = threading.Lock()
         self.auth_endpoints = [
             "/api/v2/auth/token/get",
             "/api/v2/auth/access_token/get",
@@ -54,17 +85,17 @@ class ShopeeAPIClient(IAPIClient):
 
         try:
             if method == "GET":
-                response = requests.get(
+                response = self.session.get(
                     url, params=request_params, headers=headers)
             else:
-                response = requests.post(
+                response = self.session.post(
                     url, json=payload, headers=headers, params=request_params
                 )
 
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"\nDEBUG: Request failed: {str(e)}")
             if hasattr(e, "response") and e.response:
                 print(f"DEBUG: Error response: {e.response.text}")
@@ -120,16 +151,18 @@ class ShopeeAPIClient(IAPIClient):
 
     def make_request(self, endpoint, method="GET", params=None, payload=None):
         """Main API request method with auto-refresh"""
-        # Skip token check for auth endpoints
+        # Skip token check for auth endpoints. Lock supaya request paralel
+        # tidak me-refresh token yang sama berkali-kali
         if endpoint not in self.auth_endpoints:
-            if self.config.is_token_expired():
-                if not self.config.is_refresh_token_expired():
-                    print("🔃 Auto-refreshing expired access token...")
-                    if not self.refresh_access_token():
-                        raise Exception("Failed to refresh access token")
-                else:
-                    raise Exception(
-                        "Both tokens expired. Please re-authenticate.")
+            with self._token_lock:
+                if self.config.is_token_expired():
+                    if not self.config.is_refresh_token_expired():
+                        print("🔃 Auto-refreshing expired access token...")
+                        if not self.refresh_access_token():
+                            raise Exception("Failed to refresh access token")
+                    else:
+                        raise Exception(
+                            "Both tokens expired. Please re-authenticate.")
 
         # Prepare request with proper authentication
         extra_string = (
@@ -159,20 +192,13 @@ class ShopeeAPIClient(IAPIClient):
         # Process payload if needed
         if method == "POST" and payload:
             payload = self._process_price_payload(payload)
-            payload = json.loads(
-                json.dumps(
-                    payload,
-                    default=lambda x: (
-                        int(x)
-                        if isinstance(x, (np.int32, np.int64))
-                        else (
-                            float(x)
-                            if isinstance(x, (np.float32, np.float64))
-                            else str(x)
-                        )
-                    ),
-                )
-            )
+
+        # Serialisasi sekali ke bytes, tanpa round-trip json.dumps/json.loads
+        # lalu serialisasi ulang oleh requests
+        body = None
+        if method != "GET" and payload is not None:
+            body = orjson.dumps(
+                payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
 
         # Make the request
         url = f"{self.base_url}{endpoint}"
@@ -181,24 +207,24 @@ class ShopeeAPIClient(IAPIClient):
 
         try:
             if method == "GET":
-                response = requests.get(
+                response = self.session.get(
                     url, params=request_params, headers=headers)
             else:
-                response = requests.post(
-                    url, json=payload, headers=headers, params=request_params
+                response = self.session.post(
+                    url, data=body, headers=headers, params=request_params
                 )
 
             response.raise_for_status()
-            json_response = response.json()
+            json_response = orjson.loads(response.content)
 
             # Tambahkan pengecekan struktur respons
             if not isinstance(json_response, dict):
                 error_msg = f"Invalid API response structure: {
                     type(json_response)}"
                 raise Exception(error_msg)
-            return response.json()
+            return json_response
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             error_msg = f"API request to {endpoint} failed: {str(e)}"
             if hasattr(e, "response") and e.response:
                 try:
@@ -606,6 +632,7 @@ class TiktokAPIClient(IAPIClient):
         self.config = config_manager
         self.logger = logging.getLogger(__name__)
         self.api_version = "202309"
+        self.session = create_http_session()
         self.auth_endpoints = ["/api/v2/token/get", "/api/v2/token/refresh"]
 
     def make_request(
@@ -671,7 +698,7 @@ class TiktokAPIClient(IAPIClient):
             # if json_payload:
             #     self.logger.info(f"🔧 Payload: {json_payload}")
 
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 params=params,
@@ -691,7 +718,7 @@ class TiktokAPIClient(IAPIClient):
                 self.logger.error(error_msg)
                 return None
 
-            return response.json()
+            return orjson.loads(response.content)
 
         except Exception as e:
             self.logger.error(f"Request failed: {str(e)}")
@@ -759,7 +786,7 @@ class TiktokAPIClient(IAPIClient):
             }
 
             # Use the auth endpoint URL
-            response = requests.get(
+            response = self.session.get(
                 f"{self.AUTH_URL}/api/v2/token/refresh", params=params, timeout=10
             )
 
@@ -792,7 +819,7 @@ class TiktokAPIClient(IAPIClient):
                 "grant_type": "authorized_code",
             }
 
-            response = requests.get(
+            response = self.session.get(
                 f"{self.AUTH_URL}/api/v2/token/get", params=params)
             response.raise_for_status()
             response_data = response.json()
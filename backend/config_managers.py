@@ -15,6 +15,19 @@ class IConfigManager(ABC):
     def save_config(self):
         pass
 
+    @property
+    def expiry_str(self):
+        """token_expiry as display string, formatted once per expiry value"""
+        expiry = getattr(self, "token_expiry", None)
+        cached = getattr(self, "_expiry_str_cache", None)
+        if cached is None or cached[0] != expiry:
+            cached = (
+                expiry,
+                expiry.strftime("%Y-%m-%d %H:%M:%S") if expiry else "N/A",
+            )
+            self._expiry_str_cache = cached
+        return cached[1]
+
 
 class ShopeeConfigManager(IConfigManager):
     def __init__(self, fs_manager: FileSystemManager):
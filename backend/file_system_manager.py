@@ -19,12 +19,16 @@ class FileSystemManager:
             "temp_file": "temp_file",
             "report": "report",
         }
+        # Path absolut per tipe direktori, di-resolve sekali
+        self._dir_paths = {
+            dir_type: os.path.join(self.base_dir, dir_name)
+            for dir_type, dir_name in self.directories.items()
+        }
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
         """Ensure all required directories exist"""
-        for dir_name in self.directories.values():
-            dir_path = self.get_full_path(dir_name)
+        for dir_path in self._dir_paths.values():
             os.makedirs(dir_path, exist_ok=True)
 
     def get_full_path(self, dir_type: str,
@@ -39,13 +43,14 @@ class FileSystemManager:
         Returns:
             Full absolute path
         """
-        if dir_type not in self.directories:
+        try:
+            path = self._dir_paths[dir_type]
+        except KeyError:
             raise ValueError(
                 f"Invalid directory type: {dir_type}. "
                 f"Valid types are: {list(self.directories.keys())}"
-            )
+            ) from None
 
-        path = os.path.join(self.base_dir, self.directories[dir_type])
         if filename:
             path = os.path.join(path, filename)
         return path
@@ -1,6 +1,8 @@
 import os
 import json
 import pickle
+import time
+from itertools import chain, islice
 from typing import Dict, List, Optional
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
@@ -21,6 +23,12 @@ class GoogleSheetsManager:
         'https://www.googleapis.com/auth/drive.readonly'
     ]
 
+    # Berapa detik hasil is_authenticated() boleh dipakai ulang
+    AUTH_CACHE_SECONDS = 30
+
+    # Jumlah sel maksimal per request values().batchUpdate
+    UPLOAD_CHUNK_CELLS = 50000
+
     def __init__(self, fs_manager: FileSystemManager):
         self.fs = fs_manager
         self.credentials_file = self.fs.get_full_path(
@@ -31,6 +39,8 @@ class GoogleSheetsManager:
             "config", "google_sheets_settings.json")
         self.creds = None
         self.service = None
+        self._client_config = None
+        self._valid_until = 0.0
         self._load_settings()
         self._authenticate()
         self.logger = logging.getLogger(__name__)  # TAMBAH INI
@@ -76,8 +86,16 @@ class GoogleSheetsManager:
         with open(self.settings_file, 'w', encoding='utf-8') as f:
             json.dump(self.settings, f, indent=2)
 
+    def _get_client_config(self) -> Dict:
+        """Load OAuth client config once and reuse it for every flow"""
+        if self._client_config is None:
+            with open(self.credentials_file, 'r', encoding='utf-8') as f:
+                self._client_config = json.load(f)
+        return self._client_config
+
     def _authenticate(self):
         """Authenticate with Google Sheets API"""
+        self._valid_until = 0.0
         try:
             # Check if token file exists and is valid
             if os.path.exists(self.token_file):
@@ -127,8 +145,8 @@ class GoogleSheetsManager:
             print(f"🔗 Using redirect URI: {redirect_uri}")
             print(f"📋 Requested scopes: {self.SCOPES}")
 
-            flow = Flow.from_client_secrets_file(
-                self.credentials_file,
+            flow = Flow.from_client_config(
+                self._get_client_config(),
                 scopes=self.SCOPES,  # Scopes are set here during initialization
                 redirect_uri=redirect_uri
             )
@@ -169,8 +187,9 @@ class GoogleSheetsManager:
 
             print(f"🔗 Using redirect URI: {redirect_uri}")
 
-            flow = Flow.from_client_secrets_file(
-                self.credentials_file,
+            self._valid_until = 0.0
+            flow = Flow.from_client_config(
+                self._get_client_config(),
                 self.SCOPES,
                 redirect_uri=redirect_uri,
                 state=None
@@ -207,8 +226,8 @@ class GoogleSheetsManager:
                 # Coba lagi tanpa validasi scope
                 try:
                     print("🔄 Retrying token exchange without scope validation...")
-                    flow = Flow.from_client_secrets_file(
-                        self.credentials_file,
+                    flow = Flow.from_client_config(
+                        self._get_client_config(),
                         scopes=None,  # Tidak set scope untuk menghindari validasi
                         redirect_uri=redirect_uri,
                         state=None
@@ -229,25 +248,10 @@ class GoogleSheetsManager:
                 print(f"❌ Failed to save credentials: {str(save_error)}")
                 return False
 
-            # Rebuild service and test it
+            # Rebuild service
             try:
                 self.service = build('sheets', 'v4', credentials=self.creds)
                 print("✅ Google Sheets service reinitialized")
-
-                # Test the service with a simple API call
-                print("🔧 Testing Google Sheets API connection...")
-                try:
-                    # Try to get user profile to verify authentication
-                    drive_service = build(
-                        'drive', 'v3', credentials=self.creds)
-                    about = drive_service.about().get(fields="user").execute()
-                    user_email = about.get('user', {}).get(
-                        'emailAddress', 'Unknown')
-                    print(f"✅ API test successful! Connected as: {user_email}")
-                except Exception as api_test_error:
-                    print(f"⚠️ API test warning: {str(api_test_error)}")
-                    print("ℹ️ Authentication successful but API test had issues")
-
                 return True
 
             except Exception as service_error:
@@ -318,22 +322,23 @@ class GoogleSheetsManager:
             return []
 
         try:
+            # Hanya minta properti yang dipakai supaya payload kecil
             sheet_metadata = self.service.spreadsheets().get(
-                spreadsheetId=spreadsheet_id
+                spreadsheetId=spreadsheet_id,
+                fields="sheets.properties(title,sheetId,index,sheetType)"
             ).execute()
 
             sheets = sheet_metadata.get('sheets', [])
-            worksheets = []
-
-            for sheet in sheets:
-                props = sheet['properties']
-                worksheet_info = {
+            worksheets = [
+                {
                     'title': props['title'],
                     'sheet_id': props['sheetId'],
                     'index': props.get('index', 0),
                     'sheet_type': props.get('sheetType', 'GRID')
                 }
-                worksheets.append(worksheet_info)
+                for sheet in sheets
+                for props in (sheet['properties'],)
+            ]
 
             print(f"📑 Found {len(worksheets)} worksheets in spreadsheet")
 
@@ -352,7 +357,14 @@ class GoogleSheetsManager:
 
     def is_authenticated(self) -> bool:
         """Check if user is authenticated with Google"""
-        return self.creds is not None and self.creds.valid
+        now = time.monotonic()
+        if now < self._valid_until:
+            return True
+
+        valid = self.creds is not None and self.creds.valid
+        if valid:
+            self._valid_until = now + self.AUTH_CACHE_SECONDS
+        return valid
 
     def has_credentials_file(self) -> bool:
         """Check if credentials file exists"""
@@ -418,6 +430,7 @@ class GoogleSheetsManager:
 
             self.creds = None
             self.service = None
+            self._valid_until = 0.0
             print("✅ Logged out successfully")
             return True
         except Exception as e:
@@ -464,7 +477,11 @@ class GoogleSheetsManager:
             return None
 
     def upload_to_sheet(self, spreadsheet_id, sheet_name, data):
-        """Upload data to specified spreadsheet and worksheet - FIXED VERSION"""
+        """Upload data to specified spreadsheet and worksheet - FIXED VERSION
+
+        data can be a list of rows or any iterable/generator of rows; it is
+        consumed one chunk at a time.
+        """
         try:
             if not self.is_authenticated():
                 print("❌ Not authenticated with Google Sheets")
@@ -558,23 +575,34 @@ class GoogleSheetsManager:
                     except Exception as clear_error:
                         print(f"⚠️ Could not clear sheet: {clear_error}")
 
-                # Update with new data
-                batch_update_request = {
-                    'valueInputOption': 'RAW',
-                    'data': [{
-                        'range': f"'{clean_sheet_name}'!A1",
-                        'values': data,
-                        'majorDimension': 'ROWS'
-                    }]
-                }
+                # Update with new data, dipecah per blok baris supaya
+                # request tidak melewati batas ukuran Sheets API
+                rows = iter(data)
+                first_row = next(rows, None)
+                width = max(1, len(first_row)) if first_row else 1
+                chunk_rows = max(1, self.UPLOAD_CHUNK_CELLS // width)
+                if first_row is not None:
+                    rows = chain((first_row,), rows)
+
+                start = 0
+                while chunk := list(islice(rows, chunk_rows)):
+                    batch_update_request = {
+                        'valueInputOption': 'RAW',
+                        'data': [{
+                            'range': f"'{clean_sheet_name}'!A{start + 1}",
+                            'values': chunk,
+                            'majorDimension': 'ROWS'
+                        }]
+                    }
 
-                result = self.service.spreadsheets().values().batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body=batch_update_request
-                ).execute()
+                    self.service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=spreadsheet_id,
+                        body=batch_update_request
+                    ).execute()
+                    start += len(chunk)
 
                 print(
-                    f"✅ Successfully uploaded {len(data)} rows to {clean_sheet_name}")
+                    f"✅ Successfully uploaded {start} rows to {clean_sheet_name}")
                 return True
 
             except Exception as e:
@@ -1,14 +1,73 @@
 import csv
+import functools
 import logging
+import operator
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
+from urllib.parse import urlparse
 
+import pandas as pd
 from api_clients import IAPIClient
 from lazop import LazopRequest
 
 
+class RateLimiter:
+    """Sliding-window limiter: only sleeps when the per-second budget is used up"""
+
+    def __init__(self, max_per_sec=2):
+        self.max_per_sec = max_per_sec
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] >= 1.0:
+                self._timestamps.popleft()
+
+            if len(self._timestamps) >= self.max_per_sec:
+                # Tunggu hanya sisa window dari request tertua
+                time.sleep(1.0 - (now - self._timestamps[0]))
+                now = time.monotonic()
+                self._timestamps.popleft()
+
+            self._timestamps.append(now)
+
+
+# Satu limiter per host supaya semua manager berbagi budget API yang sama
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(base_url, max_per_sec=2):
+    """Return the shared RateLimiter for the host of base_url"""
+    host = urlparse(base_url).netloc or base_url
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(max_per_sec)
+        return _rate_limiters[host]
+
+
+_SHIPPING_FEE_KEYS = (
+    "buyer_paid_shipping_fee",
+    "actual_shipping_fee",
+    "shopee_shipping_rebate",
+)
+_get_fees = operator.itemgetter(*_SHIPPING_FEE_KEYS)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fmt_day(ts: int) -> str:
+    """Format a unix timestamp as a day string, cached per timestamp"""
+    return datetime.fromtimestamp(ts).strftime("%d %B %Y")
+
+
 class IOrderManager(ABC):
     @abstractmethod
     def get_order_list(self, status, days=7):
@@ -29,10 +88,21 @@ class BaseOrderManager(IOrderManager):
     MAX_DAYS = 15
     BATCH_SIZE = 50
     RATE_LIMIT_DELAY = 0.5
+    MAX_WORKERS = 8
+    RESUME_PANDAS_MIN_BYTES = 5 * 1024 * 1024
+    DATA_KEY_MAP = {
+        "/api/v2/order/get_booking_detail": "booking_list",
+        "/api/v2/order/get_order_detail": "order_list",
+        "/api/v2/order/get_booking_list": "booking_list",
+    }
 
     def __init__(self, api_client: IAPIClient):
         self.api = api_client
         self.logger = logging.getLogger(__name__)
+        base_url = getattr(api_client, "base_url", None) or getattr(
+            api_client, "BASE_URL", type(api_client).__name__)
+        self._rate_limiter = get_rate_limiter(
+            base_url, max_per_sec=round(1 / self.RATE_LIMIT_DELAY))
 
     def _get_time_range(self, days: int) -> tuple[int, int]:
         """Calculate time range for API requests"""
@@ -43,7 +113,8 @@ class BaseOrderManager(IOrderManager):
 
     def _fetch_paginated_data(self, endpoint, base_params, data_key):
         """Generic pagination handler"""
-        all_data = []
+        # deque tidak perlu realokasi saat bertambah, dijadikan list di akhir
+        all_data = deque()
         next_cursor = None
         page_count = 0
 
@@ -54,6 +125,7 @@ class BaseOrderManager(IOrderManager):
                 params["cursor"] = next_cursor
 
             try:
+                self._rate_limiter.acquire()
                 response = self.api.make_request(endpoint, params=params)
                 if not response or "response" not in response:
                     break
@@ -68,8 +140,6 @@ class BaseOrderManager(IOrderManager):
 
                 if not has_more or not next_cursor:
                     break
-
-                time.sleep(self.RATE_LIMIT_DELAY)
             except Exception as e:
                 self.logger.error(f"Page {page_count} failed: {str(e)}")
                 break
@@ -78,41 +148,39 @@ class BaseOrderManager(IOrderManager):
             f"Fetched {
                 len(all_data)} items in {page_count} pages"
         )
-        return all_data
+        return list(all_data)
 
     def format_items_for_export(self, orders, is_booking=False):
         """Generic item formatter for orders/bookings"""
         formatted_data = []
         processed_items = set()
 
-        for order in orders:
-            order_key = "booking_sn" if is_booking else "order_sn"
-            status_key = "booking_status" if is_booking else "order_status"
+        order_key = "booking_sn" if is_booking else "order_sn"
+        status_key = "booking_status" if is_booking else "order_status"
+        # Referensi lokal, dipakai di inner loop untuk setiap item
+        append = formatted_data.append
+        add = processed_items.add
 
+        for order in orders:
             order_id = order.get(order_key, "")
             status = order.get(status_key, "UNKNOWN").upper()
 
-            for item in order.get("item_list", []):
-                item_id = item.get("item_id", "")
-                model_id = item.get("model_id", "")
-                item_key = f"{order_id}_{item_id}_{model_id}"
+            for item in order.get("item_list") or ():
+                get = item.get
+                item_key = (order_id, get("item_id", ""), get("model_id", ""))
 
                 if item_key in processed_items:
                     continue
-                processed_items.add(item_key)
-
-                sku = item.get("model_sku", "") or item.get("item_sku", "")
-                model_name = item.get("model_name", "") or ""
-                quantity = item.get("model_quantity_purchased", 0)
+                add(item_key)
 
-                formatted_data.append(
+                append(
                     [
                         order_id,
-                        sku,
-                        item.get("item_name", ""),
-                        model_name,
-                        quantity,
-                        item.get("model_original_price", ""),
+                        get("model_sku", "") or get("item_sku", ""),
+                        get("item_name", ""),
+                        get("model_name", "") or "",
+                        get("model_quantity_purchased", 0),
+                        get("model_original_price", ""),
                         status,
                     ]
                 )
@@ -123,76 +191,84 @@ class BaseOrderManager(IOrderManager):
         if not order_ids:
             return []
 
-        all_data = []
-        for i in range(0, len(order_ids), self.BATCH_SIZE):
-            batch = order_ids[i: i + self.BATCH_SIZE]
+        batches = [
+            order_ids[i: i + self.BATCH_SIZE]
+            for i in range(0, len(order_ids), self.BATCH_SIZE)
+        ]
 
-            # self.logger.info(
-            #     f"Making request to {endpoint} with {len(batch)} IDs: {batch}"
-            # )
+        data_key = next(
+            (v for k, v in self.DATA_KEY_MAP.items() if k in endpoint),
+            "item_list",
+        )
 
-            params = {
-                id_field: ",".join(batch),
-                "response_optional_fields": ",".join(optional_fields),
-            }
+        def fetch(batch):
+            return self._fetch_batch(
+                batch, endpoint, id_field, optional_fields, data_key)
+
+        # Satu batch (kasus paling umum) tidak perlu thread pool
+        if len(batches) == 1:
+            return fetch(batches[0])
+
+        # Batch saling independen, kirim bersamaan; map menjaga urutan hasil.
+        # Jumlah worker dibatasi, laju request tetap diatur _rate_limiter
+        workers = min(self.MAX_WORKERS, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(fetch, batches)
+            return [entry for data in results for entry in data]
+
+    def _fetch_batch(self, batch, endpoint, id_field, optional_fields,
+                     data_key):
+        """Fetch a single batch of IDs from a detail endpoint"""
+        # self.logger.info(
+        #     f"Making request to {endpoint} with {len(batch)} IDs: {batch}"
+        # )
+
+        params = {
+            id_field: ",".join(batch),
+            "response_optional_fields": ",".join(optional_fields),
+        }
 
-            try:
-                start_time = time.time()
-                response = self.api.make_request(endpoint, params=params)
-                elapsed = time.time() - start_time
+        data = []
+        try:
+            self._rate_limiter.acquire()
+            start_time = time.time()
+            response = self.api.make_request(endpoint, params=params)
+            elapsed = time.time() - start_time
 
-                self.logger.info(f"API call completed in {elapsed:.2f}s")
+            self.logger.debug("API call completed in %.2fs", elapsed)
 
+            if self.logger.isEnabledFor(logging.DEBUG):
                 request_id = response.get(
                     "request_id", "Not available") if response else "No response"
-                self.logger.info(f"📝 Request ID: {request_id}")
-                if not response or not isinstance(response, dict):
-                    self.logger.error(
-                        f"Invalid response structure: {response}")
-                    continue
-
-                if response.get("error"):
-                    error_msg = response.get("message", "Unknown error")
-                    self.logger.error(f"API error: {error_msg}")
-                    continue
-
-                if "/api/v2/order/get_booking_detail" in endpoint:
-                    data_key = "booking_list"
-                elif "/api/v2/order/get_order_detail" in endpoint:
-                    data_key = "order_list"
-                elif "/api/v2/order/get_booking_list" in endpoint:
-                    data_key = "booking_list"
-                else:
-                    data_key = "item_list"
-
+                self.logger.debug("📝 Request ID: %s", request_id)
+            if not response or not isinstance(response, dict):
+                self.logger.error(
+                    f"Invalid response structure: {response}")
+            elif response.get("error"):
+                error_msg = response.get("message", "Unknown error")
+                self.logger.error(f"API error: {error_msg}")
+            else:
                 api_response = response.get("response", {})
                 data = api_response.get(data_key, [])
 
-                self.logger.info(
-                    f"Extracted {
-                        len(data)} items using key '{data_key}'"
-                )
+                self.logger.debug(
+                    "Extracted %d items using key '%s'", len(data), data_key)
 
                 if not data:
                     self.logger.warning(
                         f"No data found using key '{data_key}'")
 
-                all_data.extend(data)
-
-            except Exception as e:
-                self.logger.error(f"Error processing batch: {str(e)}")
-                import traceback
-
-                self.logger.error(traceback.format_exc())
-
-            time.sleep(self.RATE_LIMIT_DELAY)
+        except Exception as e:
+            self.logger.exception("Error processing batch: %s", e)
 
-        return all_data
+        return data
 
 
 class ShopeeOrderManager(BaseOrderManager):
     """Shopee-specific order operations"""
 
+    # Batch selisih ongkir yang boleh berjalan bersamaan
+    SHIPPING_BATCHES_IN_FLIGHT = 4
     ORDER_DETAIL_FIELDS = [
         "item_list",
         "package_list",
@@ -270,6 +346,7 @@ class ShopeeOrderManager(BaseOrderManager):
             raise ValueError(f"Batch size must be 1-{self.BATCH_SIZE} orders")
 
         try:
+            self._rate_limiter.acquire()
             response = self.api.make_request(
                 "/api/v2/payment/get_escrow_detail_batch",
                 method="POST",
@@ -279,10 +356,11 @@ class ShopeeOrderManager(BaseOrderManager):
             if not response or "response" not in response:
                 return [None] * len(order_sn_list)
 
-            result_map = {
-                detail["escrow_detail"]["order_sn"]: detail["escrow_detail"]
-                for detail in response["response"]
-            }
+            result_map = {}
+            for detail in response["response"]:
+                escrow_detail = detail.get("escrow_detail")
+                if escrow_detail and (sn := escrow_detail.get("order_sn")):
+                    result_map[sn] = escrow_detail
             return [result_map.get(sn) for sn in order_sn_list]
 
         except Exception as e:
@@ -297,6 +375,21 @@ class ShopeeOrderManager(BaseOrderManager):
             self.logger.error("Order SN list is empty")
             return []
 
+        results = []
+        for batch_results in self.iter_shipping_fee_difference(
+            order_sn_list, output_file=output_file, start_from=start_from
+        ):
+            results.extend(batch_results)
+        return results
+
+    def iter_shipping_fee_difference(
+        self, order_sns, output_file=None, start_from=0
+    ):
+        """Yield shipping fee results per batch, pulling order SNs lazily.
+
+        order_sns can be any iterable (e.g. a file reader); each batch is
+        appended to output_file before it is yielded.
+        """
         fieldnames = [
             "Create Time",
             "Order SN",
@@ -309,52 +402,80 @@ class ShopeeOrderManager(BaseOrderManager):
 
         # Jika output_file tidak disediakan, kita hanya kumpulkan results
         processed_orders = set()
+        out_file = None
+        writer = None
         if output_file:
             processed_orders = self._init_output_file(output_file, fieldnames)
+            # Buka sekali untuk semua batch, bukan open/close per batch
+            out_file = open(output_file, "a", newline="", encoding="utf-8",
+                            buffering=1024 * 1024)
+            writer = csv.DictWriter(out_file, fieldnames=fieldnames)
+
+        # Order yang sudah ada di output_file dilewati
+        pending = (
+            sn for sn in islice(order_sns, start_from, None)
+            if sn not in processed_orders
+        )
+        batch_no = total = 0
+        in_flight = deque()
 
-        total_orders = len(order_sn_list)
-        results = []
-
-        # Process in batches
-        for i in range(start_from, total_orders, self.BATCH_SIZE):
-            batch = order_sn_list[i: i + self.BATCH_SIZE]
-            if output_file:
-                batch = [sn for sn in batch if sn not in processed_orders]
-
-            if not batch:
-                continue
-
-            try:
-                batch_results = self._process_shipping_batch(batch)
-                if batch_results:
-                    if output_file:
-                        self._save_results(
-                            output_file, fieldnames, batch_results)
-                        processed_orders.update(
-                            [r["Order SN"] for r in batch_results])
-
-                    results.extend(batch_results)
-                    self.logger.info(
-                        f"Processed batch {i // self.BATCH_SIZE + 1}: {len(batch_results)} orders"
-                    )
-            except Exception as e:
-                self.logger.error(
-                    f"Batch {i // self.BATCH_SIZE + 1} failed: {str(e)}")
-                continue
+        try:
+            # Beberapa batch di-request bersamaan, hasil tetap ditulis urut;
+            # laju request diatur _rate_limiter di tiap panggilan API
+            with ThreadPoolExecutor(
+                max_workers=self.SHIPPING_BATCHES_IN_FLIGHT
+            ) as executor:
+                while True:
+                    while len(in_flight) < self.SHIPPING_BATCHES_IN_FLIGHT and (
+                        batch := list(islice(pending, self.BATCH_SIZE))
+                    ):
+                        batch_no += 1
+                        in_flight.append((batch_no, executor.submit(
+                            self._process_shipping_batch, batch)))
+                    if not in_flight:
+                        break
 
-            time.sleep(self.RATE_LIMIT_DELAY)
+                    done_no, future = in_flight.popleft()
+                    try:
+                        batch_results = future.result()
+                        if batch_results and writer:
+                            self._save_results(writer, out_file, batch_results)
+                            processed_orders.update(
+                                [r["Order SN"] for r in batch_results])
+                    except Exception as e:
+                        self.logger.error(f"Batch {done_no} failed: {str(e)}")
+                        continue
+
+                    if batch_results:
+                        total += len(batch_results)
+                        self.logger.info(
+                            f"Processed batch {done_no}: {len(batch_results)} orders"
+                        )
+                        yield batch_results
+        finally:
+            if out_file:
+                out_file.close()
 
-        self.logger.info(f"Completed processing {len(results)} orders")
-        return results
+        self.logger.info(f"Completed processing {total} orders")
 
     def _init_output_file(self, output_file, fieldnames):
         """Initialize output file and return processed orders"""
         processed_orders = set()
         if os.path.exists(output_file):
             try:
-                with open(output_file, "r", encoding="utf-8") as f:
-                    reader = csv.DictReader(f)
-                    processed_orders = {row["Order SN"] for row in reader}
+                # File resume besar: parser C pandas, hanya kolom Order SN
+                if os.path.getsize(output_file) > self.RESUME_PANDAS_MIN_BYTES:
+                    column = pd.read_csv(
+                        output_file, usecols=["Order SN"], dtype=str,
+                        encoding="utf-8")["Order SN"]
+                    return set(column.dropna())
+
+                with open(output_file, "r", encoding="utf-8", newline="") as f:
+                    reader = csv.reader(f)
+                    header = next(reader, None)
+                    idx = header.index("Order SN") if header else 1
+                    processed_orders = {
+                        row[idx] for row in reader if len(row) > idx}
             except Exception as e:
                 self.logger.error(f"Error reading file: {str(e)}")
         else:
@@ -370,20 +491,22 @@ class ShopeeOrderManager(BaseOrderManager):
         """Process a batch of shipping fee calculations - FIXED"""
         results = []
 
-        self.logger.info(
-            f"🔄 _process_shipping_batch processing {len(batch)} orders")
-        self.logger.info(f"📋 Batch order numbers: {batch}")
+        self.logger.debug(
+            "🔄 _process_shipping_batch processing %d orders", len(batch))
+        self.logger.debug("📋 Batch order numbers: %s", batch)
 
         try:
-            # Get escrow details
-            self.logger.info("🔍 Getting escrow details...")
-            escrow_results = self.get_escrow_details_batch(batch)
-            self.logger.info(f"📊 Got {len(escrow_results)} escrow results")
-
-            # Get order details
-            self.logger.info("🔍 Getting order details...")
-            order_details = self.get_order_details(batch)
-            self.logger.info(f"📊 Got {len(order_details)} order details")
+            # Escrow dan order details saling independen, ambil bersamaan
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                escrow_future = executor.submit(
+                    self.get_escrow_details_batch, batch)
+                order_future = executor.submit(self.get_order_details, batch)
+                escrow_results = escrow_future.result()
+                order_details = order_future.result()
+            self.logger.debug("📊 Got %d escrow results", len(escrow_results))
+            self.logger.debug("📊 Got %d order details", len(order_details))
+
+            order_by_sn = {o.get("order_sn"): o for o in order_details}
 
             processed_count = 0
             for escrow_data, order_sn in zip(escrow_results, batch):
@@ -396,31 +519,26 @@ class ShopeeOrderManager(BaseOrderManager):
                 create_time = ""
 
                 # Find matching order details
-                order_found = False
-                for order in order_details:
-                    if order.get("order_sn") == order_sn:
-                        order_found = True
-                        timestamp = order.get("create_time", 0)
-                        if timestamp:
-                            create_time = datetime.fromtimestamp(
-                                timestamp).strftime("%d %B %Y")
-
-                        # Get shipping carrier from package list
-                        package_list = order.get("package_list", [])
-                        if package_list and isinstance(package_list, list):
-                            shipping_carrier = package_list[0].get(
-                                "shipping_carrier", "")
-                        break
-
-                if not order_found:
+                order = order_by_sn.get(order_sn)
+                if order:
+                    timestamp = order.get("create_time", 0)
+                    create_time = _fmt_day(timestamp) if timestamp else ""
+
+                    # Get shipping carrier from package list
+                    package_list = order.get("package_list", [])
+                    if package_list and isinstance(package_list, list):
+                        shipping_carrier = package_list[0].get(
+                            "shipping_carrier", "")
+                else:
                     self.logger.warning(
                         f"⚠️ No order details found for {order_sn}")
 
-                order_income = escrow_data.get("order_income", {})
-                buyer_paid = float(order_income.get(
-                    "buyer_paid_shipping_fee", 0))
-                actual = float(order_income.get("actual_shipping_fee", 0))
-                rebate = float(order_income.get("shopee_shipping_rebate", 0))
+                order_income = escrow_data.get("order_income") or {}
+                try:
+                    fees = _get_fees(order_income)
+                except KeyError:
+                    fees = [order_income.get(k) for k in _SHIPPING_FEE_KEYS]
+                buyer_paid, actual, rebate = (float(x or 0) for x in fees)
 
                 result = {
                     "Create Time": create_time,
@@ -435,27 +553,25 @@ class ShopeeOrderManager(BaseOrderManager):
                 results.append(result)
                 processed_count += 1
 
-            self.logger.info(
-                f"✅ Processed {processed_count} orders in this batch")
+            self.logger.debug(
+                "✅ Processed %d orders in this batch", processed_count)
 
         except Exception as e:
-            self.logger.error(f"❌ Error processing shipping batch: {str(e)}")
-            import traceback
-            self.logger.error(traceback.format_exc())
+            self.logger.exception("❌ Error processing shipping batch: %s", e)
 
         self.logger.info(
             f"📤 Returning {len(results)} results from _process_shipping_batch")
         return results
 
-    def _save_results(self, output_file, fieldnames, results):
-        """Save results to CSV file"""
+    def _save_results(self, writer, out_file, results):
+        """Save results to the open CSV writer"""
         if not results:
             return
 
         try:
-            with open(output_file, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writerows(results)
+            writer.writerows(results)
+            # Flush per batch supaya progress tetap aman kalau proses terhenti
+            out_file.flush()
             self.logger.info(f"Saved {len(results)} results")
         except Exception as e:
             self.logger.error(f"Error saving results: {str(e)}")
@@ -491,9 +607,6 @@ class ShopeeOrderManager(BaseOrderManager):
             )
             return formatted_data
 
-        for booking in bookings:
-            self.logger.info(f"Booking structure: {list(booking.keys())}")
-
         for booking in bookings:
             booking_sn = booking.get("booking_sn", "")
             status = booking.get("booking_status", "UNKNOWN").upper()
@@ -505,7 +618,7 @@ class ShopeeOrderManager(BaseOrderManager):
             item_list = booking.get("item_list", [])
 
             if not item_list:
-                self.logger.warning(f"Booking {booking_sn} has no items")
+                self.logger.debug("Booking %s has no items", booking_sn)
                 continue
 
             for item in item_list:
@@ -514,7 +627,7 @@ class ShopeeOrderManager(BaseOrderManager):
                 item_key = f"{booking_sn}_{item_id}_{model_id}"
 
                 if item_key in processed_items:
-                    self.logger.info(f"Skipping duplicate item: {item_key}")
+                    self.logger.debug("Skipping duplicate item: %s", item_key)
                     continue
 
                 processed_items.add(item_key)
@@ -524,8 +637,8 @@ class ShopeeOrderManager(BaseOrderManager):
                 quantity = item.get("model_quantity_purchased", 0)
 
                 if not sku:
-                    self.logger.warning(
-                        f"Item in booking {booking_sn} has no SKU")
+                    self.logger.debug(
+                        "Item in booking %s has no SKU", booking_sn)
 
                 formatted_data.append(
                     [
@@ -671,59 +784,66 @@ class LazadaOrderManager(BaseOrderManager):
         if not order_id_list:
             return []
 
-        all_details = []
-        for order_id in order_id_list:
-            try:
-                # Get order items
-                items_request = LazopRequest("/order/items/get", "GET")
-                items_request.add_api_param("order_id", order_id)
-                items_response = self.api.client.execute(
-                    items_request, self.api.config.access_token
-                )
+        # Setiap order butuh 2 request terpisah, jalankan beberapa order
+        # sekaligus supaya waktu tunggu jaringan saling tumpang tindih
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            results = executor.map(self._fetch_order_detail, order_id_list)
+            return [detail for details in results for detail in details]
 
-                if items_response and hasattr(items_response, "body"):
-                    items_body = items_response.body
-                    if "code" in items_body and items_body["code"] == "0":
-                        items_data = items_body.get("data", [])
+    def _fetch_order_detail(self, order_id):
+        """Fetch items and basic info for a single Lazada order"""
+        details = []
+        try:
+            # Get order items
+            items_request = LazopRequest("/order/items/get", "GET")
+            items_request.add_api_param("order_id", order_id)
+            self._rate_limiter.acquire()
+            items_response = self.api.client.execute(
+                items_request, self.api.config.access_token
+            )
 
-                        # Get order basic info
-                        order_request = LazopRequest("/order/get", "GET")
-                        order_request.add_api_param("order_id", order_id)
-                        order_response = self.api.client.execute(
-                            order_request, self.api.config.access_token
-                        )
+            if items_response and hasattr(items_response, "body"):
+                items_body = items_response.body
+                if "code" in items_body and items_body["code"] == "0":
+                    items_data = items_body.get("data", [])
+
+                    # Get order basic info
+                    order_request = LazopRequest("/order/get", "GET")
+                    order_request.add_api_param("order_id", order_id)
+                    self._rate_limiter.acquire()
+                    order_response = self.api.client.execute(
+                        order_request, self.api.config.access_token
+                    )
 
-                        order_data = {}
-                        if order_response and hasattr(order_response, "body"):
-                            order_body = order_response.body
-                            if "code" in order_body and order_body["code"] == "0":
-                                order_data = order_body.get("data", {})
-
-                        # Combine order info with items
-                        for item in items_data:
-                            combined_data = {
-                                "order_id": order_id,
-                                "order_sn": order_data.get("order_number", ""),
-                                "status": order_data.get("status", ""),
-                                "created_at": order_data.get("created_at", ""),
-                                "item_id": item.get("item_id", ""),
-                                "sku": item.get("sku", ""),
-                                "name": item.get("name", ""),
-                                "variation": item.get("variation", ""),
-                                "quantity": int(item.get("quantity", 1)),
-                                "item_price": item.get("item_price", ""),
-                                "seller_sku": item.get("seller_sku", ""),
-                            }
-                            all_details.append(combined_data)
-
-                time.sleep(self.RATE_LIMIT_DELAY)
-            except Exception as e:
-                self.logger.error(
-                    f"Error getting details for {order_id}: {
-                        str(e)}"
-                )
+                    order_data = {}
+                    if order_response and hasattr(order_response, "body"):
+                        order_body = order_response.body
+                        if "code" in order_body and order_body["code"] == "0":
+                            order_data = order_body.get("data", {})
+
+                    # Combine order info with items
+                    for item in items_data:
+                        combined_data = {
+                            "order_id": order_id,
+                            "order_sn": order_data.get("order_number", ""),
+                            "status": order_data.get("status", ""),
+                            "created_at": order_data.get("created_at", ""),
+                            "item_id": item.get("item_id", ""),
+                            "sku": item.get("sku", ""),
+                            "name": item.get("name", ""),
+                            "variation": item.get("variation", ""),
+                            "quantity": int(item.get("quantity", 1)),
+                            "item_price": item.get("item_price", ""),
+                            "seller_sku": item.get("seller_sku", ""),
+                        }
+                        details.append(combined_data)
+        except Exception as e:
+            self.logger.error(
+                f"Error getting details for {order_id}: {
+                    str(e)}"
+            )
 
-        return all_details
+        return details
 
     def format_items_for_export(self, order_details):
         """Format Lazada order items for export - FIXED"""
@@ -765,24 +885,23 @@ class TiktokOrderManager(BaseOrderManager):
     def get_order_list(self, status, days=7):
         """Get Tiktok order list"""
         try:
-            time_from = int(
-                (datetime.now() -
-                 timedelta(
-                    days=days)).timestamp())
-            time_to = int(datetime.now().timestamp())
+            time_to = int(time.time())
+            time_from = time_to - 86400 * days
             all_orders = []
             next_page_token = ""
 
+            payload = {
+                "create_time_ge": time_from,
+                "create_time_lt": time_to,
+                "order_status": status,
+            }
             while True:
-                payload = {
-                    "create_time_ge": time_from,
-                    "create_time_lt": time_to,
-                    "order_status": status,
-                }
+                # params di-mutate make_request (timestamp/sign), buat baru
                 params = {"page_size": "100"}
                 if next_page_token:
                     params["next_page_token"] = next_page_token
 
+                self._rate_limiter.acquire()
                 response = self.api.make_request(
                     "/order/202309/orders/search",
                     method="POST",
@@ -799,7 +918,6 @@ class TiktokOrderManager(BaseOrderManager):
 
                 if not next_page_token:
                     break
-                time.sleep(self.RATE_LIMIT_DELAY)
 
             return all_orders
         except Exception as e:
@@ -1,24 +1,167 @@
-import json
+import atexit
 import logging
 import os
+import queue
+import re
+import sys
+import threading
 import time
+import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
 
 import gspread
+import orjson
 from api_clients import IAPIClient
 from config_managers import IConfigManager
 from file_system_manager import FileSystemManager
 from lazop import LazopRequest
-from order_managers import IOrderManager
+from order_managers import IOrderManager, get_rate_limiter
 from product_managers import IProductManager
-from sheet_manager import ISheetManager
+from sheet_manager import CHECK_TRUTHY_VALUES, ISheetManager
 from wallet_manager import IWalletManager
 
+_REQUIRED_TIER_KEYS = frozenset(("min_count", "unit_price", "max_count"))
+# order_numbers_<bulan>_<tahun>.txt dari export_order_numbers_to_file
+_ORDER_FILE_RE = re.compile(r"order_numbers_(\d+)_(\d+)\.txt")
+_ITEM_BASE_INFO_ENDPOINT = "/api/v2/product/get_item_base_info"
+
+# Pembersih nama sheet wallet
+_SAFE_SHEET_RE = re.compile(r"[^a-zA-Z0-9]")
+
+# Kolom sheet wallet, sama dengan key hasil process_transactions
+_WALLET_SHEET_HEADERS = (
+    "Date", "Order SN", "Description", "Amount",
+    "Status", "Transaction Type", "Tab Type", "Buyer Name",
+)
+_wallet_row_values = itemgetter(*_WALLET_SHEET_HEADERS)
+_WALLET_DATE_FMT = "%Y-%m-%d %H:%M"
+
+
+def _lazada_item_row(order_id_str, item, status_label):
+    """One Lazada export row, columns as DEFAULT_EXPORT_HEADERS"""
+    get = item.get
+    return [order_id_str, get("sku", ""), get("name", ""),
+            get("variation", ""), int(get("quantity", 1)),
+            get("item_price", ""), status_label]
+
+
+def _tiktok_item_row(order_id, item, status_label):
+    """One TikTok export row, columns as DEFAULT_EXPORT_HEADERS"""
+    get = item.get
+    return [order_id, get("seller_sku", ""), get("product_name", ""),
+            get("sku_name", ""), int(get("quantity", 1)),
+            get("original_price", ""), status_label]
+
+
+# Baris ringkasan selisih ongkir, key = kolom hasil process_shipping_fee_difference
+_SHIPPING_SUMMARY_FMT = (
+    "{Create Time:<20} {Order SN:<20} {Buyer Paid:>12.2f} {Actual:>12.2f} "
+    "{Shopee Rebate:>14.2f} {Difference:>12.2f} {Shipping Carrier:<30}"
+)
+_SHIPPING_SUMMARY_HEADER = (
+    f"{'Create Time':<20} {'Order SN':<20} {'Buyer Paid':>12} {'Actual':>12} "
+    f"{'Shopee Rebate':>14} {'Difference':>12} {'Shipping Carrier':<30}"
+)
+
+# Konfigurasi kolom sheet "Shopee Update" per jenis proses
+_SHOPEE_ITEMS_CONFIG = MappingProxyType({
+    "stock": {
+        "type": "stock",
+        "id_column": "Kode Produk",
+        "model_id_column": "Kode Variasi",
+        "value_column": "Stok",
+        "check_column": "Cek",
+    },
+    "price": {
+        "type": "price",
+        "id_column": "Kode Produk",
+        "model_id_column": "Kode Variasi",
+        "value_column": "Harga",
+        "check_column": "Cek",
+    },
+    "wholesale": {
+        "type": "wholesale",
+        "id_column": "Kode Produk",
+        "check_column": "Cek",
+        "tiers": [
+            {"min": "Min_Order1",
+             "price": "Price_Order1",
+             "max": "Max_Order1"},
+            {"min": "Min_Order2",
+             "price": "Price_Order2",
+             "max": "Max_Order2"},
+            {"min": "Min_Order3",
+             "price": "Price_Order3",
+             "max": "Max_Order3"},
+        ],
+    },
+    "wholesale_delete": {
+        "type": "wholesale_delete",
+        "id_column": "Kode Produk",
+        "check_column": "Cek",
+    },
+})
+
+# Konfigurasi kolom sheet "Lazada Update" per jenis proses
+_LAZADA_ITEMS_CONFIG = MappingProxyType({
+    "stock": {
+        "type": "stock",
+        "id_column": "Product ID",
+        "model_id_column": "SKU ID",
+        "value_column": "Stok",
+        "check_column": "Cek",
+    },
+    "price": {
+        "type": "price",
+        "id_column": "Product ID",
+        "model_id_column": "SKU ID",
+        "value_column": "Harga",
+        "check_column": "Cek",
+    },
+})
+
+
+class _ConsoleFormatter(logging.Formatter):
+    """Plain message for console output, error records prefixed with ❌"""
+
+    def format(self, record):
+        message = super().format(record)
+        return f"❌ {message}" if record.levelno >= logging.ERROR else message
+
+
+def _setup_console_logging(logger):
+    """Send _log records (extra console=True) to stdout through one handler"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_ConsoleFormatter("%(message)s"))
+    handler.addFilter(lambda record: getattr(record, "console", False))
+    logger.addHandler(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+
+
+_setup_console_logging(logging.getLogger(__name__))
+
 
 class IPlatformHandler(ABC):
     """Base class for platform handlers with common functionality"""
 
+    PRODUCT_FETCH_WORKERS = 8
+    API_LOG_KEEP = int(os.getenv("API_LOG_KEEP", "5000"))
+    DEFAULT_EXPORT_HEADERS: tuple[str, ...] = (
+        "No. Pesanan",
+        "SKU Seller",
+        "Nama Produk",
+        "Nama Variasi",
+        "Qty",
+        "Harga Jual",
+        "Status Order",
+    )
+
     def __init__(
         self,
         config: IConfigManager,
@@ -37,6 +180,23 @@ class IPlatformHandler(ABC):
         self.fs = fs_manager
         self.logger = logging.getLogger(__name__)
         self.platform_name = platform_name
+        # None = tulis status langsung, dict = buffer {sheet_name: [(row, status)]}
+        self._pending_status_updates = None
+        # Cache per run _process_items: {(item_id, model_id): Future}
+        self._product_cache = {}
+        # Buffer log per thread: .buffer None = log info langsung,
+        # list = ditahan dan dikirim sekali oleh flush_log
+        self._log_local = threading.local()
+        # Satu run update per handler; buffer status/SKU dipakai bersama
+        self._run_lock = threading.RLock()
+        # Log API response ditulis thread terpisah supaya tidak memblok request
+        self._log_queue = queue.Queue()
+        self._log_dirs = set()
+        self._status_cache = (0.0, None)
+        # {title: Worksheet}, diisi saat pertama dipakai
+        self._ws_cache = None
+        threading.Thread(target=self._log_writer_loop, daemon=True).start()
+        atexit.register(self._log_queue.join)
 
     @abstractmethod
     def auto_refresh_token(self):
@@ -56,14 +216,34 @@ class IPlatformHandler(ABC):
     def _log(self, message: str, level: str = "info"):
         """Unified logging method"""
         if level.lower() == "info":
-            self.logger.info(message)
-            print(message)
+            buffer = getattr(self._log_local, "buffer", None)
+            if buffer is not None:
+                buffer.append(message)
+                return
+            self.logger.info(message, extra={"console": True})
         elif level.lower() == "error":
-            self.logger.error(message)
-            print(f"❌ {message}")
+            self.logger.error(message, extra={"console": True})
+
+    def flush_log(self):
+        """Emit buffered info messages as one log record"""
+        buffered = getattr(self._log_local, "buffer", None)
+        self._log_local.buffer = None
+        if buffered:
+            self._log("\n".join(buffered))
+
+    @staticmethod
+    def _fmt_td(td) -> str:
+        """Format a timedelta as 'Xd Yh Zm'"""
+        hours, rem = divmod(td.seconds, 3600)
+        return f"{td.days}d {hours}h {rem // 60}m"
 
     def get_detailed_token_status(self) -> str:
         """Get detailed token status with expiration info"""
+        # Status dipanggil berulang oleh menu/API, cache sebentar
+        cached_at, cached = self._status_cache
+        if cached is not None and time.monotonic() - cached_at < 1:
+            return cached
+
         if self.config.is_token_expired():
             access_status = "❌ EXPIRED"
             if self.config.token_expiry:
@@ -75,14 +255,7 @@ class IPlatformHandler(ABC):
             access_status = "✅ VALID"
             if self.config.token_expiry:
                 time_left = self.config.token_expiry - datetime.now()
-                access_info = f"Expires in: {
-                    time_left.days}d {
-                    time_left.seconds //
-                    3600}h {
-                    (
-                        time_left.seconds %
-                        3600) //
-                    60}m"
+                access_info = f"Expires in: {self._fmt_td(time_left)}"
             else:
                 access_info = "No expiry information"
 
@@ -100,52 +273,133 @@ class IPlatformHandler(ABC):
             refresh_status = "✅ VALID"
             if self.config.refresh_token_expiry:
                 time_left = self.config.refresh_token_expiry - datetime.now()
-                refresh_info = f"Expires in: {
-                    time_left.days}d {
-                    time_left.seconds //
-                    3600}h {
-                    (
-                        time_left.seconds %
-                        3600) //
-                    60}m"
+                refresh_info = f"Expires in: {self._fmt_td(time_left)}"
             else:
                 refresh_info = "No expiry information"
 
-        return (
+        status = (
             f"{self.platform_name} Token Status:\n"
             f"  Access Token: {access_status}\n"
             f"    {access_info}\n"
             f"  Refresh Token: {refresh_status}\n"
             f"    {refresh_info}"
         )
+        self._status_cache = (time.monotonic(), status)
+        return status
 
-    def _get_or_create_worksheet(self, sheet_name: str):
-        """Get or create worksheet with error handling"""
+    def process_price_updates_direct(self):
+        """Process price updates langsung tanpa sub-menu"""
         try:
-            return self.sheet_manager.sheet.worksheet(sheet_name)
-        except gspread.WorksheetNotFound:
-            try:
-                return self.sheet_manager.sheet.add_worksheet(
-                    sheet_name, rows=10000, cols=10
-                )
-            except Exception as e:
-                if "already exists" in str(e):
-                    return self.sheet_manager.sheet.worksheet(sheet_name)
+            self._log(f"\n=== Processing {self.platform_name} Price Updates ===")
+
+            # Gunakan method yang sudah ada
+            result = self.process_price_updates()
+
+            if result:
+                self._log(
+                    f"✅ {self.platform_name} price update completed successfully")
+                return {"success": True,
+                        "message": f"{self.platform_name} price updates completed"}
+            else:
+                self._log(f"❌ {self.platform_name} price update failed")
+                return {"success": False,
+                        "message": f"{self.platform_name} price updates failed"}
+
+        except Exception as e:
+            error_msg = f"❌ Error in {self.platform_name} price update: {str(e)}"
+            self._log(error_msg)
+            return {"success": False, "message": error_msg}
+
+    def refresh_worksheets(self):
+        """Reload the worksheet cache from the spreadsheet"""
+        self._ws_cache = {
+            ws.title: ws for ws in self.sheet_manager.sheet.worksheets()
+        }
+
+    def _get_or_create_worksheet(self, sheet_name: str, refresh: bool = True):
+        """Get or create worksheet with error handling.
+
+        refresh reloads the worksheet cache first, so a sheet deleted or
+        resized in the spreadsheet is picked up at the start of each export.
+        """
+        if refresh or self._ws_cache is None:
+            self.refresh_worksheets()
+
+        worksheet = self._ws_cache.get(sheet_name)
+        if worksheet is not None:
+            return worksheet
+
+        try:
+            worksheet = self.sheet_manager.sheet.add_worksheet(
+                sheet_name, rows=10000, cols=10
+            )
+        except Exception as e:
+            if "already exists" not in str(e):
                 raise
+            worksheet = self.sheet_manager.sheet.worksheet(sheet_name)
+
+        self._ws_cache[sheet_name] = worksheet
+        return worksheet
 
     def _prepare_worksheet(self, worksheet, headers=None):
-        """Prepare worksheet with headers"""
-        worksheet.clear()
-        default_headers = [
-            "No. Pesanan",
-            "SKU Seller",
-            "Nama Produk",
-            "Nama Variasi",
-            "Qty",
-            "Harga Jual",
-            "Status Order",
-        ]
-        worksheet.append_row(headers or default_headers)
+        """Clear worksheet, write the header row and return it"""
+        headers = list(headers or self.DEFAULT_EXPORT_HEADERS)
+        # Clear + header dalam satu batchUpdate
+        self._write_export(worksheet, headers, [])
+        return headers
+
+    @staticmethod
+    def _cell_data(value) -> dict:
+        """Python value -> Sheets CellData, stored RAW like append_rows"""
+        if isinstance(value, bool):
+            return {"userEnteredValue": {"boolValue": value}}
+        if isinstance(value, (int, float)):
+            return {"userEnteredValue": {"numberValue": value}}
+        return {"userEnteredValue": {
+            "stringValue": "" if value is None else str(value)}}
+
+    def _write_export(self, worksheet, headers, rows):
+        """Clear worksheet and write header + rows in one batchUpdate request.
+
+        The header is written even when rows is empty. The grid is grown
+        in the same request when the data does not fit.
+        """
+        sheet_id = worksheet.id
+        requests = [{
+            "updateCells": {
+                "range": {"sheetId": sheet_id},
+                "fields": "userEnteredValue",
+            }
+        }]
+
+        values = [headers, *rows]
+        current_rows, current_cols = worksheet.row_count, worksheet.col_count
+        # Ukuran grid absolut, bukan append relatif terhadap hitungan cache
+        grid = {
+            "rowCount": max(len(values), current_rows),
+            "columnCount": max(max(map(len, values)), current_cols),
+        }
+        if (grid["rowCount"], grid["columnCount"]) != (
+                current_rows, current_cols):
+            requests.append({"updateSheetProperties": {
+                "properties": {"sheetId": sheet_id, "gridProperties": grid},
+                "fields": "gridProperties.rowCount,gridProperties.columnCount",
+            }})
+        requests.append({
+            "updateCells": {
+                "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+                "rows": [
+                    {"values": [self._cell_data(v) for v in row]}
+                    for row in values
+                ],
+                "fields": "userEnteredValue",
+            }
+        })
+
+        worksheet.spreadsheet.batch_update({"requests": requests})
+
+        # batch_update tidak memperbarui properti Worksheet yang di-cache
+        worksheet._properties.setdefault("gridProperties", {}).update(grid)
 
     def _log_result(self, processed: int, skipped: int,
                     failed: int, operation: str):
@@ -158,147 +412,212 @@ class IPlatformHandler(ABC):
 
     def _should_process_record(self, record):
         """Determine if record should be processed based on 'Cek' column"""
-        if "Cek" not in record:
-            return False
+        cek_value = record.get("Cek")
+        return cek_value is True or (
+            cek_value is not None
+            and cek_value is not False
+            and str(cek_value).strip().upper() in CHECK_TRUTHY_VALUES
+        )
 
-        cek_value = record["Cek"]
-        if isinstance(cek_value, bool) and cek_value:
-            return True
-        return str(cek_value).strip().upper() in ["TRUE", "1", "YES", "Y", "X"]
+    @staticmethod
+    def _parse_id(value):
+        """Sheet ID cell -> int, or None if empty/non-numeric"""
+        if isinstance(value, int):
+            return value
+        return int(value) if value and str(value).isdigit() else None
+
+    def _normalize_item_ids(self, items: list) -> list:
+        """Parse item_id/model_id to int|None once at sheet-read time"""
+        for item in items:
+            item["item_id"] = self._parse_id(item["item_id"])
+            if "model_id" in item:
+                item["model_id"] = self._parse_id(item["model_id"])
+        return items
 
     def _validate_basic_item(self, item: dict) -> bool:
         """Validate basic item from sheet"""
-        if not item["item_id"] or not str(item["item_id"]).isdigit():
+        if self._parse_id(item["item_id"]) is None:
             self._update_item_status(item["row"], "FAILED: Invalid Product ID")
             return False
         return True
 
+    def _product_key(self, item: dict) -> tuple:
+        """(item_id, model_id) used for the product detail request"""
+        return self._parse_id(item["item_id"]), self._parse_id(item["model_id"])
+
+    def _prefetch_product_info(self, items: list):
+        """Start product detail requests for all valid items concurrently"""
+        executor = ThreadPoolExecutor(max_workers=self.PRODUCT_FETCH_WORKERS)
+        for item in items:
+            if self._parse_id(item["item_id"]) is None:
+                continue
+            # Baris dengan produk/model yang sama cukup satu request
+            key = self._product_key(item)
+            if key not in self._product_cache:
+                self._product_cache[key] = executor.submit(
+                    self.product_manager.get_product_details, *key)
+        executor.shutdown(wait=False)
+
     def _get_product_info(self, item: dict) -> dict | None:
         """Get product info from API"""
-        item_id = int(item["item_id"])
-        model_id = (
-            int(item["model_id"])
-            if item["model_id"] and str(item["model_id"]).isdigit()
-            else None
-        )
+        key = self._product_key(item)
+        future = self._product_cache.get(key)
+        if future is not None:
+            product_info = future.result()
+        else:
+            product_info = self.product_manager.get_product_details(*key)
 
-        product_info = self.product_manager.get_product_details(
-            item_id, model_id)
         if not product_info:
             self._update_item_status(item["row"], "FAILED: Product not found")
         return product_info
 
     def _log_product_info(self, item: dict, product_info: dict):
         """Log product information"""
+        # Lewati format string per baris kalau level INFO tidak aktif
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         self._log(
-            f"\nProcessing row {
-                item['row']}: ID: {
-                product_info['item_id']} - Model: {
-                item.get(
-                    'model_id', '')}"
+            "\nProcessing row %s: ID: %s - Model: %s"
+            % (item["row"], product_info["item_id"], item.get("model_id", ""))
         )
-        self._log(f"Product: {product_info['full_name']}")
+        self._log("Product: %s" % product_info["full_name"])
 
     def _handle_api_response(self, response: dict,
                              row: int, base_msg: str) -> str:
         """Handle API response and update status"""
-        if response and not response.get("error"):
-            if "success_list" in response.get("response", {}):
-                if response["response"]["success_list"]:
-                    self._update_item_status(
-                        row=row, status="SUCCESS", log_msg=base_msg
-                    )
-                    return "processed"
-                else:
-                    failure_list = response["response"].get("failure_list", [])
-                    reason = (
-                        failure_list[0].get("failed_reason", "Unknown error")
-                        if failure_list
-                        else "No success or failure in response"
-                    )
-                    self._update_item_status(
-                        row=row, status=f"FAILED: {reason}", log_msg=base_msg
-                    )
-                    return "failed"
-            else:
-                self._update_item_status(
-                    row=row, status="SUCCESS", log_msg=base_msg)
-                return "processed"
-        else:
-            error_msg = (
-                response.get("message", "No response from API")
-                if response
-                else "No response from API"
-            )
+        if not response or response.get("error"):
+            error_msg = (response or {}).get("message", "No response from API")
             self._update_item_status(
                 row=row, status=f"FAILED: {error_msg}", log_msg=base_msg
             )
             return "failed"
 
+        body = response.get("response") or {}
+        # Tanpa success_list dianggap sukses; success_list kosong = gagal
+        if "success_list" not in body or body["success_list"]:
+            self._update_item_status(
+                row=row, status="SUCCESS", log_msg=base_msg)
+            return "processed"
+
+        failure_list = body.get("failure_list")
+        reason = (
+            failure_list[0].get("failed_reason", "Unknown error")
+            if failure_list
+            else "No success or failure in response"
+        )
+        self._update_item_status(
+            row=row, status=f"FAILED: {reason}", log_msg=base_msg
+        )
+        return "failed"
+
     def _save_api_response(self, endpoint, payload, response):
         """Save API request/response to file for analysis (common for all platforms)"""
+        self._log_queue.put((endpoint, payload, response, datetime.now()))
+
+    def _log_writer_loop(self):
+        """Background writer for queued _save_api_response entries"""
+        while True:
+            entry = self._log_queue.get()
+            try:
+                self._write_api_response(*entry)
+            finally:
+                self._log_queue.task_done()
+
+    def _prune_api_logs(self, log_dir):
+        """Keep only the newest API_LOG_KEEP log files in log_dir"""
+        try:
+            entries = [e for e in os.scandir(log_dir)
+                       if e.is_file() and e.name.endswith(".json")]
+            if len(entries) <= self.API_LOG_KEEP:
+                return
+
+            # Nama file diawali endpoint, jadi urutkan berdasarkan mtime
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:len(entries) - self.API_LOG_KEEP]:
+                os.unlink(entry.path)
+        except OSError as e:
+            self.logger.warning("Failed to prune %s: %s", log_dir, e)
+
+    def _write_api_response(self, endpoint, payload, response, logged_at):
+        """Write one API request/response log file"""
         try:
             log_dir = f"api_logs/{self.platform_name.lower()}"
-            os.makedirs(log_dir, exist_ok=True)
+            if log_dir not in self._log_dirs:
+                os.makedirs(log_dir, exist_ok=True)
+                self._log_dirs.add(log_dir)
+                self._prune_api_logs(log_dir)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            timestamp = logged_at.strftime("%Y%m%d_%H%M%S_%f")
             filename = f"{log_dir}/{endpoint}_{timestamp}.json"
 
+            # LazopResponse: simpan body-nya; tipe lain yang tidak dikenal
+            # orjson ditangani default=str
             serializable_response = response
             if hasattr(response, "body"):
                 serializable_response = response.body
-            elif not isinstance(
-                response, (dict, list, str, int, float, bool, type(None))
-            ):
-                serializable_response = str(response)
 
             log_data = {
-                "timestamp": str(datetime.now()),
+                "timestamp": str(logged_at),
                 "endpoint": endpoint,
                 "payload": payload,
                 "response": serializable_response,
             }
 
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(log_data, f, ensure_ascii=False, indent=2)
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(
+                    log_data,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                ))
 
-            self._log(f"✅ Saved API response to {filename}")
+            self.logger.debug("✅ Saved API response to %s", filename)
         except Exception as e:
-            self._log(f"⚠️ Failed to save API log: {str(e)}")
+            self.logger.warning("⚠️ Failed to save API log: %s", e)
 
     def _process_items(self, items: list,
                        process_type: str) -> tuple[int, int, int]:
         """Process items from sheet (stock/price)"""
         processed = skipped = failed = 0
 
-        for item in items:
+        with self._run_lock:
+            # Request produk jalan paralel, validasi/update tetap berurutan
+            self._prefetch_product_info(items)
+
+            # Kumpulkan status dan tulis sekaligus di akhir
+            self._pending_status_updates = {}
             try:
-                if not self._validate_basic_item(item):
-                    failed += 1
-                    continue
+                for item in items:
+                    try:
+                        if not self._validate_basic_item(item):
+                            failed += 1
+                            continue
 
-                product_info = self._get_product_info(item)
-                if not product_info:
-                    failed += 1
-                    continue
+                        product_info = self._get_product_info(item)
+                        if not product_info:
+                            failed += 1
+                            continue
 
-                self._log_product_info(item, product_info)
+                        self._log_product_info(item, product_info)
 
-                if process_type == "stock":
-                    result = self._process_stock_item(item, product_info)
-                else:
-                    result = self._process_price_item(item, product_info)
+                        if process_type == "stock":
+                            result = self._process_stock_item(item, product_info)
+                        else:
+                            result = self._process_price_item(item, product_info)
 
-                if result == "processed":
-                    processed += 1
-                elif result == "skipped":
-                    skipped += 1
-                else:
-                    failed += 1
+                        if result == "processed":
+                            processed += 1
+                        elif result == "skipped":
+                            skipped += 1
+                        else:
+                            failed += 1
 
-            except Exception as e:
-                self._update_item_status(item["row"], f"FAILED: {str(e)}")
-                failed += 1
+                    except Exception as e:
+                        self._update_item_status(item["row"], f"FAILED: {str(e)}")
+                        failed += 1
+            finally:
+                self.flush_statuses()
+                self._product_cache.clear()
 
         return processed, skipped, failed
 
@@ -410,15 +729,19 @@ class IPlatformHandler(ABC):
             if not isinstance(sheet_name, str) or len(sheet_name) > 50:
                 sheet_name = self.default_sheet_name
 
-            success = self.sheet_manager.update_status(
-                row=row, status=status, sheet_name=sheet_name
-            )
-
-            if not success:
-                print(
-                    f"⚠️ Failed to update status for row {row} in sheet '{sheet_name}'"
+            if self._pending_status_updates is not None:
+                self._pending_status_updates.setdefault(
+                    sheet_name, []).append((row, status))
+            else:
+                success = self.sheet_manager.update_status(
+                    row=row, status=status, sheet_name=sheet_name
                 )
 
+                if not success:
+                    print(
+                        f"⚠️ Failed to update status for row {row} in sheet '{sheet_name}'"
+                    )
+
             if log_msg:
                 full_msg = (
                     f"{log_msg} - Status: {status}" if include_status else log_msg
@@ -426,17 +749,68 @@ class IPlatformHandler(ABC):
                 self._log(f">>> {full_msg}")
         except Exception as e:
             print(f"🔥 CRITICAL ERROR in _update_item_status: {str(e)}")
-            import traceback
-
             traceback.print_exc()
 
+    def flush_statuses(self):
+        """Write buffered status updates, one batch request per sheet"""
+        pending, self._pending_status_updates = self._pending_status_updates, None
+        for sheet_name, updates in (pending or {}).items():
+            if not self.sheet_manager.update_statuses(updates, sheet_name):
+                print(
+                    f"⚠️ Failed to update {len(updates)} statuses in sheet '{sheet_name}'"
+                )
+
+    def _fetch_order_lists(self, statuses, days, fetch=None) -> list:
+        """[(status, orders)] in the given order, statuses fetched concurrently"""
+        if not statuses:
+            return []
+        fetch = fetch or self.order_manager.get_order_list
+        # Tiap status satu request list terpisah, jalankan bersamaan
+        with ThreadPoolExecutor(max_workers=len(statuses)) as executor:
+            return list(zip(statuses, executor.map(
+                lambda status: fetch(status, days), statuses)))
+
 
 class ShopeePlatformHandler(IPlatformHandler):
     MAX_STOCK = 99999
     MIN_PRICE = 1000
     PRICE_TOLERANCE = 50
+    WHOLESALE_PREFETCH_BATCH = 50
+    WHOLESALE_WORKERS = 8
     default_sheet_name = "Shopee Update"
 
+    # Teks menu statis, di-print sekali tanpa lewat logger
+    _TOKEN_MENU = (
+        "\nShopee Token Management:\n"
+        "1. Update Authorization Code\n"
+        "2. Get Access Token\n"
+        "3. Back to Token Menu"
+    )
+    _OPERATIONS_MENU = (
+        "\nShopee Operations:\n"
+        "1. Export Orders\n"
+        "2. Update Stock\n"
+        "3. Update Prices\n"
+        "4. Check Shipping Fees\n"
+        "5. Wallet Transactions\n"
+        "6. Back to Main Menu"
+    )
+    _EXPORT_MENU = (
+        "\n📤 Export Shopee Orders to Google Sheet\n"
+        "1. Export UNPAID orders\n"
+        "2. Export READY_TO_SHIP orders\n"
+        "3. Export PROCESSED orders\n"
+        "4. Export COMPLETED orders\n"
+        "5. Export ALL orders (combined)\n"
+        "6. Back to Shopee menu"
+    )
+    _SHIPPING_FEE_MENU = (
+        "\n=== Shipping Fee Difference Checker ===\n"
+        "1. Get Order Numbers & Process\n"
+        "2. Process Existing Order Numbers\n"
+        "3. Back to Main Menu"
+    )
+
     def __init__(self, config, api, product_manager, order_manager, wallet_manager, sheet_manager, fs_manager, google_sheets_manager=None):
         super().__init__(
             config,
@@ -449,6 +823,15 @@ class ShopeePlatformHandler(IPlatformHandler):
         )
         self.wallet_manager = wallet_manager
         self.google_sheets_manager = google_sheets_manager  # TAMBAH INI
+        # Cache per aksi harga, dikosongkan oleh _reset_price_caches
+        # {item_id: wholesale_tier_list}
+        self._wholesale_cache = {}
+        # {(item_id, model_id): product_info}
+        self._product_info_cache = {}
+        # Hasil per item_id yang dibagi antar tahap delete -> regular -> wholesale
+        self._workflow_state = {}
+        # Limiter per host, dipakai bersama order manager Shopee
+        self._api_limiter = get_rate_limiter(self.api.base_url)
 
     def auto_refresh_token(self):
         """Auto-refresh platform token if needed with detailed info"""
@@ -469,8 +852,7 @@ class ShopeePlatformHandler(IPlatformHandler):
 
             try:
                 if self.api.refresh_access_token():
-                    expiry_time = self.config.token_expiry.strftime(
-                        "%Y-%m-%d %H:%M:%S")
+                    expiry_time = self.config.expiry_str
                     self._log(
                         f"🔃 {
                             self.platform_name} token refreshed successfully!"
@@ -491,8 +873,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 )
                 return False
         else:
-            expiry_time = self.config.token_expiry.strftime(
-                "%Y-%m-%d %H:%M:%S")
+            expiry_time = self.config.expiry_str
             self._log(
                 f"✅ {
                     self.platform_name} token is valid until {expiry_time}"
@@ -502,10 +883,7 @@ class ShopeePlatformHandler(IPlatformHandler):
     def show_token_menu(self):
         """Show Shopee token management menu"""
         while True:
-            self._log("\nShopee Token Management:")
-            self._log("1. Update Authorization Code")
-            self._log("2. Get Access Token")
-            self._log("3. Back to Token Menu")
+            print(self._TOKEN_MENU)
 
             choice = input("Enter your choice (1-3): ").strip()
 
@@ -523,13 +901,7 @@ class ShopeePlatformHandler(IPlatformHandler):
 
     def show_operations_menu(self):
         """Show Shopee operations menu"""
-        self._log("\nShopee Operations:")
-        self._log("1. Export Orders")
-        self._log("2. Update Stock")
-        self._log("3. Update Prices")
-        self._log("4. Check Shipping Fees")
-        self._log("5. Wallet Transactions")
-        self._log("6. Back to Main Menu")
+        print(self._OPERATIONS_MENU)
 
         choice = input("Enter your choice (1-6): ").strip()
 
@@ -555,13 +927,7 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log("\n🔐 No access token found. Please get access token first!")
             return
 
-        self._log("\n📤 Export Shopee Orders to Google Sheet")
-        self._log("1. Export UNPAID orders")
-        self._log("2. Export READY_TO_SHIP orders")
-        self._log("3. Export PROCESSED orders")
-        self._log("4. Export COMPLETED orders")
-        self._log("5. Export ALL orders (combined)")
-        self._log("6. Back to Shopee menu")
+        print(self._EXPORT_MENU)
 
         choice = input("Enter your choice (1-6): ").strip()
 
@@ -589,30 +955,37 @@ class ShopeePlatformHandler(IPlatformHandler):
 
             if order_type == "ALL":
                 # Export all order types
-                self._prepare_worksheet(worksheet)
-                all_data = []
+                headers = list(self.DEFAULT_EXPORT_HEADERS)
 
                 order_types = [
                     "UNPAID",
                     "READY_TO_SHIP",
                     "PROCESSED",
                     "COMPLETED"]
-                for order_type in order_types:
-                    orders = self.order_manager.get_order_list(
-                        order_type, days)
-                    if orders:
-                        order_sns = [order["order_sn"] for order in orders]
-                        order_details = self.order_manager.get_order_details(
-                            order_sns)
-                        time.sleep(2)
-                        if order_details:
-                            formatted_data = self.order_manager.format_items_for_export(
-                                order_details
-                            )
-                            all_data.extend(formatted_data)
 
+                def fetch_formatted(status):
+                    orders = self.order_manager.get_order_list(status, days)
+                    if not orders:
+                        return []
+                    order_sns = list(dict.fromkeys(o["order_sn"] for o in orders))
+                    order_details = self.order_manager.get_order_details(
+                        order_sns)
+                    if not order_details:
+                        return []
+                    return self.order_manager.format_items_for_export(
+                        order_details)
+
+                # Tiap status independen; throttling sudah di rate limiter
+                # order manager, jadi tidak perlu sleep antar status
+                with ThreadPoolExecutor(max_workers=len(order_types)) as executor:
+                    all_data = [
+                        row
+                        for rows in executor.map(fetch_formatted, order_types)
+                        for row in rows
+                    ]
+
+                self._write_export(worksheet, headers, all_data)
                 if all_data:
-                    worksheet.append_rows(all_data)
                     self._log(
                         f"✅ Successfully exported {
                             len(all_data)} total orders"
@@ -620,26 +993,27 @@ class ShopeePlatformHandler(IPlatformHandler):
                     return True
             else:
                 # Export specific order type
-                self._prepare_worksheet(worksheet)
+                headers = list(self.DEFAULT_EXPORT_HEADERS)
                 orders = self.order_manager.get_order_list(order_type, days)
                 if not orders:
                     self._log(f"❌ No {order_type} orders found")
+                    self._write_export(worksheet, headers, [])
                     return False
 
-                order_sns = [order["order_sn"] for order in orders]
+                order_sns = list(dict.fromkeys(o["order_sn"] for o in orders))
                 order_details = self.order_manager.get_order_details(order_sns)
-                time.sleep(2)
                 if not order_details:
                     self._log(f"❌ No details for {order_type} orders")
+                    self._write_export(worksheet, headers, [])
                     return False
 
                 formatted_data = self.order_manager.format_items_for_export(
                     order_details
                 )
+                self._write_export(worksheet, headers, formatted_data)
                 if not formatted_data:
                     return False
 
-                worksheet.append_rows(formatted_data)
                 unique_orders = len({row[0] for row in formatted_data})
                 self._log(
                     f"✅ Successfully exported {unique_orders} {order_type} orders"
@@ -661,20 +1035,21 @@ class ShopeePlatformHandler(IPlatformHandler):
     ) -> bool:
         """Export single status orders to sheet with accurate row counting"""
         try:
-            worksheet = self._get_or_create_worksheet("Shopee Orders")
+            # Batch lanjutan memakai cache dari batch pertama
+            worksheet = self._get_or_create_worksheet(
+                "Shopee Orders", refresh=is_first_batch)
 
+            headers = None
             if is_first_batch:
-                worksheet.clear()
-                self._prepare_worksheet(worksheet)
+                headers = self._prepare_worksheet(worksheet)
 
             orders = self.order_manager.get_order_list(status, days)
             if not orders:
                 self._log(f"❌ No {status} orders found")
                 return False
 
-            order_sns = [order["order_sn"] for order in orders]
+            order_sns = list(dict.fromkeys(o["order_sn"] for o in orders))
             order_details = self.order_manager.get_order_details(order_sns)
-            time.sleep(2)
             if not order_details:
                 self._log(f"❌ No details for {status} orders")
                 return False
@@ -708,29 +1083,18 @@ class ShopeePlatformHandler(IPlatformHandler):
 
         try:
             worksheet = self._get_or_create_worksheet("Shopee Orders")
-            self._prepare_worksheet(worksheet)
-
-            all_data = []
-            counts = {
-                "UNPAID": 0,
-                "READY_TO_SHIP_ORDERS": 0,
-                "READY_TO_SHIP_BOOKINGS": 0,
-            }
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
-            unpaid_data = self._process_orders("UNPAID")
-            counts["UNPAID"] = len(unpaid_data)
-            all_data.extend(unpaid_data)
-
-            ready_order_data = self._process_orders("READY_TO_SHIP")
-            counts["READY_TO_SHIP_ORDERS"] = len(ready_order_data)
-            all_data.extend(ready_order_data)
-
-            booking_data = self._process_bookings("READY_TO_SHIP")
-            counts["READY_TO_SHIP_BOOKINGS"] = len(booking_data)
-            all_data.extend(booking_data)
+            all_data, counts = self._collect_export_data(
+                [
+                    ("UNPAID", self._process_orders, "UNPAID"),
+                    ("READY_TO_SHIP_ORDERS", self._process_orders, "READY_TO_SHIP"),
+                    ("READY_TO_SHIP_BOOKINGS", self._process_bookings, "READY_TO_SHIP"),
+                ]
+            )
 
+            self._write_export(worksheet, headers, all_data)
             if all_data:
-                worksheet.append_rows(all_data)
                 return True
 
             self._log("⚠️ No data to export")
@@ -748,34 +1112,19 @@ class ShopeePlatformHandler(IPlatformHandler):
 
         try:
             worksheet = self._get_or_create_worksheet("Shopee Orders")
-            self._prepare_worksheet(worksheet)
-
-            all_data = []
-            counts = {
-                "UNPAID": 0,
-                "READY_TO_SHIP_ORDERS": 0,
-                "PROCESSED_ORDERS": 0,
-                "READY_TO_SHIP_BOOKINGS": 0,
-            }
-
-            unpaid_data = self._process_orders("UNPAID")
-            counts["UNPAID"] = len(unpaid_data)
-            all_data.extend(unpaid_data)
-
-            ready_order_data = self._process_orders("READY_TO_SHIP")
-            counts["READY_TO_SHIP_ORDERS"] = len(ready_order_data)
-            all_data.extend(ready_order_data)
-
-            processed_order_data = self._process_orders("PROCESSED")
-            counts["PROCESSED_ORDERS"] = len(processed_order_data)
-            all_data.extend(processed_order_data)
-
-            booking_data = self._process_bookings("READY_TO_SHIP")
-            counts["READY_TO_SHIP_BOOKINGS"] = len(booking_data)
-            all_data.extend(booking_data)
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
+
+            all_data, counts = self._collect_export_data(
+                [
+                    ("UNPAID", self._process_orders, "UNPAID"),
+                    ("READY_TO_SHIP_ORDERS", self._process_orders, "READY_TO_SHIP"),
+                    ("PROCESSED_ORDERS", self._process_orders, "PROCESSED"),
+                    ("READY_TO_SHIP_BOOKINGS", self._process_bookings, "READY_TO_SHIP"),
+                ]
+            )
 
+            self._write_export(worksheet, headers, all_data)
             if all_data:
-                worksheet.append_rows(all_data)
                 return True
 
             self._log("⚠️ No data to export")
@@ -789,10 +1138,7 @@ class ShopeePlatformHandler(IPlatformHandler):
 
     def check_shipping_fee_difference(self):
         """Shipping fee checker"""
-        self._log("\n=== Shipping Fee Difference Checker ===")
-        self._log("1. Get Order Numbers & Process")
-        self._log("2. Process Existing Order Numbers")
-        self._log("3. Back to Main Menu")
+        print(self._SHIPPING_FEE_MENU)
 
         choice = input("Enter your choice (1-3): ").strip()
 
@@ -833,7 +1179,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 self._log(f">>> Status: {status_msg}")
                 return
 
-            product_info = self.product_manager.get_product_details(item_id)
+            product_info = self._get_product_details_cached(item_id)
             if not product_info:
                 status_msg = "FAILED: Product not found"
                 self._update_item_status(item["row"], status_msg)
@@ -856,9 +1202,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 return
 
             for tier in new_tiers:
-                if not all(
-                    key in tier for key in ["min_count", "unit_price", "max_count"]
-                ):
+                if not _REQUIRED_TIER_KEYS.issubset(tier.keys()):
                     status_msg = "FAILED: Invalid wholesale tier structure"
                     self._update_item_status(item["row"], status_msg)
                     self._log(f">>> Status: {status_msg}")
@@ -868,6 +1212,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 item_id, new_tiers)
 
             if response and not response.get("error"):
+                self._wholesale_cache[item_id] = new_tiers
                 status_msg = "SUCCESS"
                 self._update_item_status(item["row"], status_msg)
                 self._log(f">>> Status: {status_msg}")
@@ -887,41 +1232,110 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log(f">>> Status: {status_msg}")
             self.logger.exception(f"Error processing row {item['row']}")
 
+    def _reset_price_caches(self):
+        """Drop product/tier data cached by the previous price action"""
+        self._wholesale_cache = {}
+        self._product_info_cache = {}
+        self._workflow_state = {}
+
+    def _mark_unchanged_wholesale(self, wholesale_items, price_items):
+        """Flag items whose tiers already match the sheet for this workflow.
+
+        Items that also get a regular price update are left alone, since
+        their tiers have to be removed before the price can change.
+        """
+        price_ids = {item["item_id"] for item in price_items}
+        self._prefetch_wholesale_tiers(
+            [item["item_id"] for item in wholesale_items])
+        for item in wholesale_items:
+            item_id = item["item_id"]
+            if (
+                item_id is None
+                or item_id in price_ids
+                or item_id not in self._wholesale_cache
+                or not item.get("wholesale_tiers")
+            ):
+                continue
+            if self._compare_wholesale_tiers(
+                self._wholesale_cache[item_id], item["wholesale_tiers"]
+            ):
+                self._workflow_state[item_id] = "SKIPPED_UNCHANGED"
+
+    def _get_product_details_cached(self, item_id, model_id=None):
+        """get_product_details, memoized until _reset_price_caches"""
+        key = (item_id, model_id)
+        product_info = self._product_info_cache.get(key)
+        if product_info is None:
+            self._api_limiter.acquire()
+            product_info = self.product_manager.get_product_details(
+                item_id, model_id)
+            # Hasil kosong tidak di-cache supaya bisa dicoba lagi
+            if product_info:
+                self._product_info_cache[key] = product_info
+        return product_info
+
+    def _prefetch_wholesale_tiers(self, item_ids):
+        """Fill _wholesale_cache for many items, up to 50 IDs per request.
+
+        The same base info also fills _product_info_cache for the item
+        (no model), so the per-row product status/name lookup is skipped.
+        """
+        tiers = self._wholesale_cache
+        ids = list(dict.fromkeys(
+            i for i in item_ids if i is not None and i not in tiers))
+        for start in range(0, len(ids), self.WHOLESALE_PREFETCH_BATCH):
+            chunk = ids[start: start + self.WHOLESALE_PREFETCH_BATCH]
+            try:
+                self._api_limiter.acquire()
+                response = self.api.make_request(
+                    endpoint=_ITEM_BASE_INFO_ENDPOINT,
+                    params={"item_id_list": ",".join(map(str, chunk))},
+                )
+                for item_data in response["response"]["item_list"]:
+                    tiers[item_data["item_id"]] = item_data.get(
+                        "wholesale_tier_list", [])
+                    self._product_info_cache[(item_data["item_id"], None)] = (
+                        self.product_manager.product_info_from_base(item_data))
+            except Exception as e:
+                self.logger.warning(
+                    "Wholesale tier prefetch failed for %d items: %s",
+                    len(chunk), e)
+
     def _get_current_wholesale_tiers(self, item_id):
         """Get current wholesale tiers from API"""
+        if item_id in self._wholesale_cache:
+            return self._wholesale_cache[item_id]
+
         try:
-            params = {"item_id": item_id}
+            self._api_limiter.acquire()
             response = self.api.make_request(
-                endpoint="/api/v2/product/get_item_base_info", params=params
+                endpoint=_ITEM_BASE_INFO_ENDPOINT, params={"item_id": item_id}
             )
-
-            if (
-                response
-                and "response" in response
-                and "item_list" in response["response"]
-            ):
-                item_data = response["response"]["item_list"][0]
-                return item_data.get("wholesale_tier_list", [])
+            tiers = response["response"]["item_list"][0].get(
+                "wholesale_tier_list", [])
         except Exception:
-            pass
-        return []
+            return []
+
+        self._wholesale_cache[item_id] = tiers
+        return tiers
 
     def _compare_wholesale_tiers(self, current_tiers, new_tiers):
         """Compare if wholesale tiers are identical"""
         if len(current_tiers) != len(new_tiers):
             return False
 
-        def normalize_tier(tier):
-            return {
-                "min_count": int(tier.get("min_count", 0)),
-                "max_count": int(tier.get("max_count", 0)),
-                "unit_price": float(tier.get("unit_price", 0)),
-            }
-
-        current_normalized = [normalize_tier(t) for t in current_tiers]
-        new_normalized = [normalize_tier(t) for t in new_tiers]
+        # Urutan tier dari API tidak dijamin, bandingkan setelah diurutkan
+        return sorted(map(self._tier_key, current_tiers)) == sorted(
+            map(self._tier_key, new_tiers))
 
-        return current_normalized == new_normalized
+    @staticmethod
+    def _tier_key(tier):
+        """(min_count, max_count, price in cents) for tier comparison"""
+        return (
+            int(tier.get("min_count", 0)),
+            int(tier.get("max_count", 0)),
+            round(float(tier.get("unit_price", 0)) * 100),
+        )
 
     def _process_regular_price_updates(self):
         """Process regular price updates"""
@@ -975,18 +1389,16 @@ class ShopeePlatformHandler(IPlatformHandler):
                     str(e)}",
                 "error",
             )
-            import traceback
-
             traceback.print_exc()
             return False
 
     def _process_order_numbers_file(self, input_file, month, year):
         """Process order numbers from file and generate report - FIXED"""
         try:
-            with open(input_file, "r", encoding="utf-8") as f:
-                order_sn_list = [line.strip() for line in f if line.strip()]
-
-            if not order_sn_list:
+            # File dibaca bertahap, batch pertama jalan tanpa menunggu file habis
+            order_sns = self._iter_order_sns(input_file)
+            first_sn = next(order_sns, None)
+            if first_sn is None:
                 self._log("No order numbers found in file")
                 return False
 
@@ -994,15 +1406,14 @@ class ShopeePlatformHandler(IPlatformHandler):
                 "report", f"Selisih_Ongkir_Shopee_{month:02d}_{year}.csv"
             )
 
-            self._log(f"\nProcessing {len(order_sn_list)} orders...")
+            self._log(f"\nProcessing orders from {input_file}...")
             self._log(f"Output will be saved to: {output_file}")
 
-            results = self.order_manager.process_shipping_fee_difference(
-                order_sn_list, output_file=output_file
+            batches = self.order_manager.iter_shipping_fee_difference(
+                chain((first_sn,), order_sns), output_file=output_file
             )
 
-            if results:
-                self._display_shipping_fee_summary(results)
+            if self._display_shipping_fee_summary(batches):
                 self._log(f"\n✅ Final results saved to {output_file}")
                 return True
             else:
@@ -1013,42 +1424,59 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log(f"Error processing file: {str(e)}", "error")
             return False
 
-    def _display_shipping_fee_summary(self, results: list):
-        """Display summary of shipping fee differences"""
-        if not results:
+    @staticmethod
+    def _iter_order_sns(path):
+        """Yield stripped, non-empty order numbers from an order numbers file"""
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                order_sn = line.strip()
+                if order_sn:
+                    yield order_sn
+
+    def _display_shipping_fee_summary(self, batches) -> int:
+        """Display shipping fee differences per batch, returns row count"""
+        count = 0
+        total_difference = 0
+        for batch in batches:
+            if not batch:
+                continue
+            # Satu _log per batch, bukan per baris
+            lines = [] if count else [
+                "\nShipping Fee Difference Summary:",
+                "-" * 110,
+                _SHIPPING_SUMMARY_HEADER,
+                "-" * 110,
+            ]
+            lines.extend(map(_SHIPPING_SUMMARY_FMT.format_map, batch))
+            self._log("\n".join(lines))
+            count += len(batch)
+            total_difference += sum(r["Difference"] for r in batch)
+
+        if not count:
             self._log("No results to display")
-            return
+            return 0
 
-        self._log("\nShipping Fee Difference Summary:")
-        self._log("-" * 110)
-        self._log(
-            f"{
-                'Create Time':<20} {
-                'Order SN':<20} {
-                'Buyer Paid':>12} {
-                'Actual':>12} {
-                    'Shopee Rebate':>14} {
-                        'Difference':>12} {
-                            'Shipping Carrier':<30}"
-        )
-        self._log("-" * 110)
+        self._log("\n".join((
+            "-" * 110,
+            f"{'TOTAL DIFFERENCE':<72} {total_difference:>12.2f}",
+            "-" * 110,
+        )))
+        return count
 
-        total_difference = 0
-        for result in results:
-            self._log(
-                f"{result.get('Create Time', ''):<20} "
-                f"{result.get('Order SN', ''):<20} "
-                f"{result.get('Buyer Paid', 0):>12.2f} "
-                f"{result.get('Actual', 0):>12.2f} "
-                f"{result.get('Shopee Rebate', 0):>14.2f} "
-                f"{result.get('Difference', 0):>12.2f} "
-                f"{result.get('Shipping Carrier', ''):<30}"
-            )
-            total_difference += result.get("Difference", 0)
+    def _collect_export_data(self, jobs: list) -> tuple[list, dict]:
+        """Run (count_key, fetch_fn, status) jobs concurrently, keep job order"""
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [(key, executor.submit(fn, status))
+                       for key, fn, status in jobs]
+
+            all_data = []
+            counts = {}
+            for key, future in futures:
+                data = future.result()
+                counts[key] = len(data)
+                all_data.extend(data)
 
-        self._log("-" * 110)
-        self._log(f"{'TOTAL DIFFERENCE':<72} {total_difference:>12.2f}")
-        self._log("-" * 110)
+        return all_data, counts
 
     def _process_orders(self, status: str) -> list:
         """Process orders of specific status"""
@@ -1059,7 +1487,7 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log(f"No {status} orders found")
             return []
 
-        order_sns = [order["order_sn"] for order in orders]
+        order_sns = list(dict.fromkeys(o["order_sn"] for o in orders))
         order_details = self.order_manager.get_order_details(order_sns)
 
         if not order_details:
@@ -1073,49 +1501,11 @@ class ShopeePlatformHandler(IPlatformHandler):
         return formatted_orders
 
     def _get_items_to_process(self, process_type: str) -> list:
-        config_map = {
-            "stock": {
-                "type": "stock",
-                "id_column": "Kode Produk",
-                "model_id_column": "Kode Variasi",
-                "value_column": "Stok",
-                "check_column": "Cek",
-            },
-            "price": {
-                "type": "price",
-                "id_column": "Kode Produk",
-                "model_id_column": "Kode Variasi",
-                "value_column": "Harga",
-                "check_column": "Cek",
-            },
-            "wholesale": {
-                "type": "wholesale",
-                "id_column": "Kode Produk",
-                "check_column": "Cek",
-                "tiers": [
-                    {"min": "Min_Order1",
-                     "price": "Price_Order1",
-                     "max": "Max_Order1"},
-                    {"min": "Min_Order2",
-                     "price": "Price_Order2",
-                     "max": "Max_Order2"},
-                    {"min": "Min_Order3",
-                     "price": "Price_Order3",
-                     "max": "Max_Order3"},
-                ],
-            },
-            "wholesale_delete": {
-                "type": "wholesale_delete",
-                "id_column": "Kode Produk",
-                "check_column": "Cek",
-            },
-        }
-
-        if process_type not in config_map:
+        if process_type not in _SHOPEE_ITEMS_CONFIG:
             return []
 
-        return self.sheet_manager.get_data(
-            "Shopee Update", config_map[process_type])
+        return self._normalize_item_ids(self.sheet_manager.get_data(
+            "Shopee Update", _SHOPEE_ITEMS_CONFIG[process_type]))
 
     def _process_bookings(self, status: str) -> list:
         """Process bookings with detailed validation and enhanced logging"""
@@ -1131,7 +1521,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 self._log(f"No {status} bookings found")
                 return []
 
-            booking_sns = [b["booking_sn"] for b in bookings]
+            booking_sns = list(dict.fromkeys(b["booking_sn"] for b in bookings))
 
             booking_details = self.order_manager.get_booking_detail(
                 booking_sns)
@@ -1140,22 +1530,23 @@ class ShopeePlatformHandler(IPlatformHandler):
                 self._log(f"❌ No details for {status} bookings")
                 return []
 
+            # Satu pass: filter, hitung yang beda status, simpan beberapa contoh
             valid_bookings = []
+            mismatched = 0
+            samples = []
             for b in booking_details:
-                if b.get("booking_status") == status:
+                booking_status = b.get("booking_status")
+                if booking_status == status:
                     valid_bookings.append(b)
-                else:
-                    self._log(
-                        f"⚠️ Booking SN {
-                            b.get('booking_sn')} has status {
-                            b.get('booking_status')} (expected {status})"
-                    )
+                    continue
+                mismatched += 1
+                if len(samples) < 5:
+                    samples.append(f"{b.get('booking_sn')}={booking_status}")
 
-            if len(valid_bookings) != len(booking_details):
+            if mismatched:
                 self._log(
-                    f"⚠️ Filtered {
-                        len(booking_details) -
-                        len(valid_bookings)} invalid bookings"
+                    f"⚠️ Filtered {mismatched} bookings with status other than "
+                    f"{status} (e.g. {', '.join(samples)})"
                 )
 
             formatted_bookings = self.order_manager.format_bookings_for_export(
@@ -1166,8 +1557,6 @@ class ShopeePlatformHandler(IPlatformHandler):
 
         except Exception as e:
             self._log(f"🔥 Error processing bookings: {str(e)}", "error")
-            import traceback
-
             self._log(traceback.format_exc(), "debug")
             return []
 
@@ -1180,6 +1569,7 @@ class ShopeePlatformHandler(IPlatformHandler):
         self._log("4. Back to Main Menu")
 
         choice = input("Enter your choice (1-4): ").strip()
+        self._reset_price_caches()
 
         if choice == "1":
             self._process_regular_price_updates()
@@ -1189,15 +1579,22 @@ class ShopeePlatformHandler(IPlatformHandler):
             if regular_result["processed"] > 0 or regular_result["skipped"] > 0:
                 processed_item_ids = set()
                 wholesale_items = self._get_items_to_process("wholesale")
-                for item in wholesale_items:
-                    item_id = int(item["item_id"])
-                    if item_id in processed_item_ids:
-                        self._update_item_status(
-                            item["row"], "SKIPPED: Duplicate item ID"
-                        )
-                        continue
-                    processed_item_ids.add(item_id)
-                    self._process_single_wholesale_item(item)
+                self._prefetch_wholesale_tiers(
+                    [item["item_id"] for item in wholesale_items])
+                with self._run_lock:
+                    self._pending_status_updates = {}
+                    try:
+                        for item in wholesale_items:
+                            item_id = int(item["item_id"])
+                            if item_id in processed_item_ids:
+                                self._update_item_status(
+                                    item["row"], "SKIPPED: Duplicate item ID"
+                                )
+                                continue
+                            processed_item_ids.add(item_id)
+                            self._process_single_wholesale_item(item)
+                    finally:
+                        self.flush_statuses()
         elif choice == "3":
             self.process_delete_wholesale()
         elif choice == "4":
@@ -1205,70 +1602,107 @@ class ShopeePlatformHandler(IPlatformHandler):
         else:
             self._log("Invalid choice")
 
-    def process_delete_wholesale(self):
+    def process_delete_wholesale(self, items=None):
         """Process wholesale deletion from Google Sheet"""
         self._log("\n=== Processing Wholesale Deletion ===")
-        items = self._get_items_to_process("wholesale_delete")
+        if items is None:
+            items = self._get_items_to_process("wholesale_delete")
         if not items:
             self._log("No items marked for wholesale deletion")
-            return
+            return {"processed": 0, "skipped": 0, "failed": 0}
 
-        processed = skipped = failed = 0
-        processed_item_ids = set()
+        self._prefetch_wholesale_tiers([item["item_id"] for item in items])
+        counts = self._run_wholesale_jobs(items, self._delete_one_wholesale)
+        self._log_result(
+            counts["processed"], counts["skipped"], counts["failed"],
+            "Wholesale deletion")
+        return counts
 
-        for item in items:
-            try:
-                item_id = int(item["item_id"])
+    def _delete_one_wholesale(self, item):
+        """Delete wholesale tiers of one item, returns (status_msg, bucket)"""
+        item_id = int(item["item_id"])
+        if self._workflow_state.get(item_id) == "SKIPPED_UNCHANGED":
+            return "SKIPPED: Wholesale tiers unchanged", "skipped"
 
-                if item_id in processed_item_ids:
-                    self._update_item_status(
-                        item["row"], "SKIPPED: Duplicate item ID")
-                    skipped += 1
-                    continue
+        product_info = self._get_product_details_cached(item_id)
+        if not product_info:
+            self._workflow_state[item_id] = "NOT_FOUND"
+            return "FAILED: Product not found", "failed"
 
-                processed_item_ids.add(item_id)
+        self._log(f"\nProcessing row {item['row']}: ID: {item_id}")
+        self._log(f"Product: {product_info['full_name']}")
 
-                product_info = self.product_manager.get_product_details(
-                    item_id)
-                if not product_info:
-                    self._update_item_status(
-                        item["row"], "FAILED: Product not found")
-                    failed += 1
-                    continue
+        self._api_limiter.acquire()
+        response = self.product_manager.delete_wholesale_tiers(item_id)
 
-                self._log(f"\nProcessing row {item['row']}: ID: {item_id}")
-                self._log(f"Product: {product_info['full_name']}")
+        if response and not response.get("error"):
+            self._wholesale_cache[item_id] = []
+            return "SUCCESS", "processed"
+        error_msg = (
+            response.get("message", "No response from API")
+            if response
+            else "No response from API"
+        )
+        return f"FAILED: {error_msg}", "failed"
 
-                response = self.product_manager.delete_wholesale_tiers(item_id)
+    def _run_wholesale_jobs(self, items, worker):
+        """Run worker(item) concurrently, one task per unique item ID.
 
-                if response and not response.get("error"):
-                    self._update_item_status(item["row"], "SUCCESS")
-                    processed += 1
-                else:
-                    error_msg = (
-                        response.get("message", "No response from API")
-                        if response
-                        else "No response from API"
-                    )
-                    self._update_item_status(
-                        item["row"], f"FAILED: {error_msg}")
-                    failed += 1
+        Sheet status is written from the calling thread only.
+        """
+        counts = {"processed": 0, "skipped": 0, "failed": 0}
+        unique_items = {}
 
-            except Exception as e:
-                self._update_item_status(item["row"], f"FAILED: {str(e)}")
-                failed += 1
+        with self._run_lock:
+            # Kumpulkan status dan tulis sekaligus di akhir
+            self._pending_status_updates = {}
+            try:
+                for item in items:
+                    try:
+                        item_id = int(item["item_id"])
+                    except (TypeError, ValueError) as e:
+                        self._update_item_status(item["row"], f"FAILED: {str(e)}")
+                        counts["failed"] += 1
+                        continue
+
+                    if item_id in unique_items:
+                        self._update_item_status(
+                            item["row"], "SKIPPED: Duplicate item ID")
+                        counts["skipped"] += 1
+                        continue
+                    unique_items[item_id] = item
 
-        self._log_result(processed, skipped, failed, "Wholesale deletion")
+                with ThreadPoolExecutor(max_workers=self.WHOLESALE_WORKERS) as executor:
+                    futures = {
+                        executor.submit(worker, item): item
+                        for item in unique_items.values()
+                    }
+                    for future in as_completed(futures):
+                        item = futures[future]
+                        try:
+                            status_msg, bucket = future.result()
+                        except Exception as e:
+                            status_msg, bucket = f"FAILED: {str(e)}", "failed"
+                            self._log(
+                                f"❌ Error processing wholesale for row {item['row']}: {str(e)}")
+                        self._update_item_status(item["row"], status_msg)
+                        counts[bucket] += 1
+            finally:
+                self.flush_statuses()
+
+        return counts
 
     def show_shipping_file_list(self):
         """Display list of available shipping files for processing - FIXED VERSION"""
         try:
             temp_dir = self.fs.get_full_path("temp_file")
-            files = [
-                f
-                for f in os.listdir(temp_dir)
-                if f.startswith("order_numbers_") and f.endswith(".txt")
-            ]
+            with os.scandir(temp_dir) as it:
+                files = [
+                    entry
+                    for entry in it
+                    if entry.name.startswith("order_numbers_")
+                    and entry.name.endswith(".txt")
+                ]
 
             if not files:
                 self._log("❌ No order number files found in temp_file directory")
@@ -1278,19 +1712,18 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log("-" * 50)
 
             file_info = []
-            for i, filename in enumerate(files, 1):
-                file_path = os.path.join(temp_dir, filename)
-                stats = os.stat(file_path)
+            for i, entry in enumerate(files, 1):
+                filename = entry.name
+                stats = entry.stat()
                 file_size = stats.st_size
                 modified_time = datetime.fromtimestamp(stats.st_mtime).strftime(
                     "%Y-%m-%d %H:%M:%S"
                 )
 
                 # Extract month and year from filename
-                parts = filename.split("_")
-                if len(parts) >= 4:
-                    month = parts[2]
-                    year = parts[3].split(".")[0]
+                match = _ORDER_FILE_RE.fullmatch(filename)
+                if match:
+                    month, year = match.groups()
                     description = f"Orders from {month}/{year}"
                 else:
                     description = "Unknown date"
@@ -1329,10 +1762,9 @@ class ShopeePlatformHandler(IPlatformHandler):
                 return False
 
             # Extract month and year from filename
-            parts = filename.split("_")
-            if len(parts) >= 4:
-                month = int(parts[2])
-                year = int(parts[3].split(".")[0])
+            match = _ORDER_FILE_RE.fullmatch(filename)
+            if match:
+                month, year = map(int, match.groups())
 
                 self._log(f"🔄 Processing file: {filename}")
                 self._log(f"📅 Month: {month}, Year: {year}")
@@ -1374,103 +1806,72 @@ class ShopeePlatformHandler(IPlatformHandler):
             self._log(f"❌ Error in _process_existing_order_numbers: {str(e)}")
             return False
 
-    def _process_wholesale_updates(self):
+    def _process_wholesale_updates(self, items=None):
         """Process wholesale updates dengan logging yang lebih baik"""
-        items = self._get_items_to_process("wholesale")
+        if items is None:
+            items = self._get_items_to_process("wholesale")
         if not items:
             self._log("❌ No items marked for wholesale processing")
             return {"processed": 0, "skipped": 0, "failed": 0}
 
-        processed = skipped = failed = 0
-        processed_item_ids = set()
+        self._prefetch_wholesale_tiers([item["item_id"] for item in items])
+        counts = self._run_wholesale_jobs(items, self._process_one_wholesale)
 
-        for item in items:
-            try:
-                item_id = int(item["item_id"])
+        self._log_result(
+            counts["processed"], counts["skipped"], counts["failed"],
+            "Wholesale price update")
+        return counts
 
-                if item_id in processed_item_ids:
-                    self._update_item_status(
-                        item["row"], "SKIPPED: Duplicate item ID")
-                    skipped += 1
-                    continue
+    def _process_one_wholesale(self, item):
+        """Update wholesale tiers of one item, returns (status_msg, bucket)"""
+        item_id = int(item["item_id"])
+        state = self._workflow_state.get(item_id)
+        if state == "SKIPPED_UNCHANGED":
+            return "SKIPPED: Wholesale tiers unchanged", "skipped"
+        if state == "NOT_FOUND":
+            return "FAILED: Product not found", "failed"
+
+        # Sheet wholesale tidak punya kolom model, cukup item_id
+        product_info = self._get_product_details_cached(item_id)
+        if not product_info:
+            return "FAILED: Product not found", "failed"
 
-                processed_item_ids.add(item_id)
+        self._log_product_info(item, product_info)
 
-                # Get product info
-                product_info = self._get_product_info(item)
-                if not product_info:
-                    failed += 1
-                    continue
+        if product_info["status"] != "NORMAL":
+            return f"FAILED: Item status {product_info['status']}", "failed"
 
-                self._log_product_info(item, product_info)
+        if not item.get("wholesale_tiers"):
+            return "FAILED: No wholesale tiers provided", "failed"
 
-                # Check product status
-                if product_info["status"] != "NORMAL":
-                    status_msg = f"FAILED: Item status {
-                        product_info['status']}"
-                    self._update_item_status(item["row"], status_msg)
-                    failed += 1
-                    continue
+        current_tiers = self._get_current_wholesale_tiers(item_id)
+        if self._compare_wholesale_tiers(current_tiers, item["wholesale_tiers"]):
+            return "SKIPPED: Wholesale tiers unchanged", "skipped"
 
-                # Validate wholesale tiers
-                if not item.get("wholesale_tiers"):
-                    self._update_item_status(
-                        item["row"], "FAILED: No wholesale tiers provided"
-                    )
-                    failed += 1
-                    continue
-
-                # Check for duplicate tiers
-                current_tiers = self._get_current_wholesale_tiers(item_id)
-                if self._compare_wholesale_tiers(
-                    current_tiers, item["wholesale_tiers"]
-                ):
-                    self._update_item_status(
-                        item["row"], "SKIPPED: Wholesale tiers unchanged"
-                    )
-                    skipped += 1
-                    continue
-
-                # Update wholesale price
-                response = self.product_manager.update_wholesale_price(
-                    item_id, item["wholesale_tiers"]
-                )
-
-                if response and not response.get("error"):
-                    self._update_item_status(item["row"], "SUCCESS")
-                    processed += 1
-                    self._log(
-                        f"✅ Successfully updated wholesale price for item {item_id}"
-                    )
-                else:
-                    error_msg = (
-                        response.get("message", "No response from API")
-                        if response
-                        else "No response from API"
-                    )
-                    status_msg = f"FAILED: {error_msg}"
-                    self._update_item_status(item["row"], status_msg)
-                    failed += 1
-                    self._log(
-                        f"❌ Failed to update wholesale price for item {item_id}: {error_msg}"
-                    )
+        self._api_limiter.acquire()
+        response = self.product_manager.update_wholesale_price(
+            item_id, item["wholesale_tiers"]
+        )
 
-            except Exception as e:
-                error_msg = f"FAILED: {str(e)}"
-                self._update_item_status(item["row"], error_msg)
-                failed += 1
-                self._log(
-                    f"❌ Error processing wholesale for row {
-                        item['row']}: {
-                        str(e)}"
-                )
+        if response and not response.get("error"):
+            self._wholesale_cache[item_id] = item["wholesale_tiers"]
+            self._log(
+                f"✅ Successfully updated wholesale price for item {item_id}")
+            return "SUCCESS", "processed"
 
-        self._log_result(processed, skipped, failed, "Wholesale price update")
-        return {"processed": processed, "skipped": skipped, "failed": failed}
+        error_msg = (
+            response.get("message", "No response from API")
+            if response
+            else "No response from API"
+        )
+        self._log(
+            f"❌ Failed to update wholesale price for item {item_id}: {error_msg}")
+        return f"FAILED: {error_msg}", "failed"
 
-    def _process_regular_price_updates_for_wholesale(self):
+    def _process_regular_price_updates_for_wholesale(self, items=None):
         """Process regular price updates dengan logging yang lebih baik"""
-        items = self._get_items_to_process("price")
+        if items is None:
+            items = self._get_items_to_process("price")
         if not items:
             self._log("❌ No items marked for regular price processing")
             return {"processed": 0, "skipped": 0, "failed": 0}
@@ -1501,6 +1902,7 @@ class ShopeePlatformHandler(IPlatformHandler):
 
     def process_price_updates_direct(self, price_type="regular"):
         """Process price updates directly without submenu"""
+        self._reset_price_caches()
         try:
             self._log(
                 f"\n=== Processing Shopee {
@@ -1511,14 +1913,38 @@ class ShopeePlatformHandler(IPlatformHandler):
                 result = self._process_regular_price_updates_for_wholesale()
                 return result
             elif price_type == "wholesale":
+                empty = {"processed": 0, "skipped": 0, "failed": 0}
+                # Baris Cek tanpa tier tetap ikut delete, jadi acuan
+                # "tidak ada yang diproses" adalah daftar wholesale_delete
+                delete_items = self._get_items_to_process("wholesale_delete")
+                if not delete_items:
+                    self._log("❌ No items marked for wholesale processing")
+                    return {
+                        "regular": dict(empty),
+                        "wholesale": dict(empty),
+                        "delete": dict(empty),
+                    }
+
+                wholesale_items = self._get_items_to_process("wholesale")
+                price_items = self._get_items_to_process("price")
+                # Tier yang sudah sama tidak perlu dihapus lalu dibuat ulang
+                self._mark_unchanged_wholesale(wholesale_items, price_items)
+
                 # First delete existing wholesale tiers
-                delete_result = self.process_delete_wholesale()
+                delete_result = self.process_delete_wholesale(delete_items)
 
                 # Then update regular prices
-                regular_result = self._process_regular_price_updates_for_wholesale()
+                regular_result = (
+                    self._process_regular_price_updates_for_wholesale(
+                        price_items)
+                    if price_items else dict(empty)
+                )
 
                 # Finally process wholesale tiers
-                wholesale_result = self._process_wholesale_updates()
+                wholesale_result = (
+                    self._process_wholesale_updates(wholesale_items)
+                    if wholesale_items else dict(empty)
+                )
                 return {
                     "regular": regular_result,
                     "wholesale": wholesale_result,
@@ -1592,7 +2018,7 @@ class ShopeePlatformHandler(IPlatformHandler):
             success = self.google_sheets_manager.upload_to_sheet(
                 spreadsheet_id=wallet_spreadsheet_id,
                 sheet_name=safe_sheet_name,
-                data=self._prepare_wallet_data_for_sheets(processed_data)
+                data=self._iter_wallet_rows(processed_data)
             )
 
             if success:
@@ -1604,15 +2030,11 @@ class ShopeePlatformHandler(IPlatformHandler):
 
         except Exception as e:
             print(f"❌ [SHOPEE] Error in wallet export: {str(e)}")
-            import traceback
             traceback.print_exc()
             return False
 
     def _generate_wallet_sheet_name(self, month, year, transaction_type):
         """Generate safe sheet name for wallet export"""
-        import re
-        from datetime import datetime
-
         # Default values jika tidak ada
         if not month:
             month = datetime.now().month
@@ -1622,37 +2044,21 @@ class ShopeePlatformHandler(IPlatformHandler):
         # Clean transaction type untuk nama sheet
         clean_type = "all"
         if transaction_type:
-            clean_type = re.sub(r'[^a-zA-Z0-9]', '_', transaction_type).lower()
+            clean_type = _SAFE_SHEET_RE.sub('_', transaction_type).lower()
 
         base_name = f"Wallet_{month:02d}_{year}_{clean_type}"
 
-        # Clean untuk Google Sheets requirements (max 31 chars, no special chars)
-        safe_name = re.sub(r'[^\w\s-]', '', base_name)
-        safe_name = re.sub(r'[-\s]+', '_', safe_name)
-        safe_name = safe_name.strip('_')
-
-        return safe_name[:31]  # Google Sheets limit
-
-    def _prepare_wallet_data_for_sheets(self, processed_data):
-        """Prepare wallet data for Google Sheets format"""
-        headers = ["Date", "Order SN", "Description", "Amount",
-                   "Status", "Transaction Type", "Tab Type", "Buyer Name"]
-        data = [headers]
-
-        for tx in processed_data["transactions"]:
-            row = [
-                tx["Date"].strftime("%Y-%m-%d %H:%M"),
-                tx["Order SN"],
-                tx["Description"],
-                tx["Amount"],
-                tx["Status"],
-                tx["Transaction Type"],
-                tx["Tab Type"],
-                tx["Buyer Name"]
-            ]
-            data.append(row)
+        # clean_type sudah lewat _SAFE_SHEET_RE, base_name hanya berisi
+        # [A-Za-z0-9_]; cukup rapikan underscore dan potong ke 31 karakter
+        return base_name.strip('_')[:31]  # Google Sheets limit
+
+    def _iter_wallet_rows(self, processed_data):
+        """Yield wallet rows in Google Sheets format, header first"""
+        yield list(_WALLET_SHEET_HEADERS)
 
-        return data
+        for date, *rest in map(_wallet_row_values,
+                               processed_data["transactions"]):
+            yield [date.strftime(_WALLET_DATE_FMT), *rest]
 
     def process_shipping_fee_to_sheets(self, option, month=None, year=None):
         """Process shipping fee difference and export directly to Google Sheets - FIXED VERSION"""
@@ -1692,34 +2098,12 @@ class ShopeePlatformHandler(IPlatformHandler):
                 self._log(
                     f"📊 Retrieved {len(raw_transactions)} raw transactions from wallet")
 
-                # Export order numbers to file
-                filename, count = self.wallet_manager.export_order_numbers_to_file(
-                    raw_transactions, month, year
-                )
-
-                if not filename or count == 0:
-                    self._log("❌ Failed to export order numbers to file")
-                    return False
-
-                self._log(f"✅ Exported {count} order numbers to {filename}")
-
-                # Read the file
-                import os
-                if not os.path.exists(filename):
-                    self._log(f"❌ File {filename} does not exist")
-                    return False
-
-                with open(filename, "r", encoding="utf-8") as f:
-                    file_content = f.read().strip()
-                    order_sn_list = [
-                        line.strip() for line in file_content.split('\n') if line.strip()]
-
-                self._log(
-                    f"📖 Read file: {len(order_sn_list)} order numbers from file")
+                # Order number langsung dari transaksi, tanpa file perantara
+                order_sn_list = self.wallet_manager.get_order_numbers(
+                    raw_transactions)
 
                 if not order_sn_list:
-                    self._log(
-                        "❌ No order numbers found in the file after reading")
+                    self._log("❌ No order numbers found in wallet transactions")
                     return False
 
                 self._log(
@@ -1748,8 +2132,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                     f"📤 Exporting {len(results)} results to Google Sheets...")
 
                 # Buat nama sheet yang lebih baik
-                import datetime
-                current_date = datetime.datetime.now().strftime("%Y%m%d")
+                current_date = datetime.now().strftime("%Y%m%d")
                 sheet_name = f"Shipping_{month:02d}_{year}_{current_date}"
 
                 success = self.order_manager.export_shipping_fee_to_google_sheets(
@@ -1762,15 +2145,6 @@ class ShopeePlatformHandler(IPlatformHandler):
                 if success:
                     self._log(
                         f"✅ Successfully exported {len(results)} shipping fee records to Google Sheets")
-                    # Hapus file temporary setelah berhasil export ke Google Sheets
-                    try:
-                        if 'filename' in locals():
-                            os.remove(filename)
-                            self._log(
-                                f"🧹 Temporary file {filename} cleaned up")
-                    except Exception as e:
-                        self._log(
-                            f"⚠️ Failed to clean up temporary file: {str(e)}")
                 else:
                     self._log(
                         "❌ Failed to export shipping fee to Google Sheets")
@@ -1782,7 +2156,6 @@ class ShopeePlatformHandler(IPlatformHandler):
 
         except Exception as e:
             self._log(f"❌ Error in process_shipping_fee_to_sheets: {str(e)}")
-            import traceback
             traceback.print_exc()
             return False
 
@@ -1845,8 +2218,7 @@ class ShopeePlatformHandler(IPlatformHandler):
                 all_orders = []
                 statuses = self._get_order_statuses_for_platform()
 
-                for status in statuses:
-                    orders = self.order_manager.get_order_list(status, days)
+                for _, orders in self._fetch_order_lists(statuses, days):
                     all_orders.extend(orders)
 
                 if not all_orders:
@@ -1905,7 +2277,6 @@ class ShopeePlatformHandler(IPlatformHandler):
         except Exception as e:
             self.logger.error(
                 f"❌ Error exporting orders to Google Sheets: {str(e)}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
 
@@ -1935,6 +2306,13 @@ class LazadaPlatformHandler(IPlatformHandler):
     MAX_STOCK = 99999
     MIN_PRICE = 1000
     PRICE_TOLERANCE = 50
+    ORDER_ITEM_WORKERS = 16
+    # Batas order_ids per request /orders/items/get
+    ORDER_ITEMS_BATCH_SIZE = 50
+    # Detik hasil get_order_list dipakai ulang oleh export_orders_by_type
+    ORDER_LIST_TTL = 60
+    # Batas SKU per request /product/price_quantity/update
+    SKU_BATCH_SIZE = 50
     default_sheet_name = "Lazada Update"
 
     def __init__(
@@ -1957,6 +2335,10 @@ class LazadaPlatformHandler(IPlatformHandler):
             "Lazada",
         )
         self.google_sheets_manager = google_sheets_manager
+        # [(item, sku_payload, base_msg)] menunggu dikirim per batch
+        self._queued_sku_updates = []
+        # {(status, days, access_token): (monotonic_time, orders)}
+        self._order_list_cache = {}
 
     def auto_refresh_token(self):
         """Auto-refresh platform token if needed with detailed info"""
@@ -1977,8 +2359,7 @@ class LazadaPlatformHandler(IPlatformHandler):
 
             try:
                 if self.api.refresh_access_token():
-                    expiry_time = self.config.token_expiry.strftime(
-                        "%Y-%m-%d %H:%M:%S")
+                    expiry_time = self.config.expiry_str
                     self._log(
                         f"🔃 {
                             self.platform_name} token refreshed successfully!"
@@ -1999,8 +2380,7 @@ class LazadaPlatformHandler(IPlatformHandler):
                 )
                 return False
         else:
-            expiry_time = self.config.token_expiry.strftime(
-                "%Y-%m-%d %H:%M:%S")
+            expiry_time = self.config.expiry_str
             self._log(
                 f"✅ {
                     self.platform_name} token is valid until {expiry_time}"
@@ -2082,6 +2462,56 @@ class LazadaPlatformHandler(IPlatformHandler):
             )
             return []
 
+    def _get_order_items_batch(self, order_ids: list) -> dict:
+        """Get items for up to ORDER_ITEMS_BATCH_SIZE orders as {order_id: items}"""
+        try:
+            request = LazopRequest("/orders/items/get", "GET")
+            request.add_api_param(
+                "order_ids", f"[{','.join(map(str, order_ids))}]")
+
+            response = self.api.client.execute(
+                request, self.api.config.access_token)
+
+            if response and "code" in response.body and response.body["code"] == "0":
+                return {
+                    str(entry.get("order_id")): entry.get("order_items", [])
+                    for entry in response.body.get("data", [])
+                }
+            return {}
+
+        except Exception as e:
+            self._log(
+                f"Error getting items for {len(order_ids)} orders: {
+                    str(e)}",
+                "error",
+            )
+            return {}
+
+    def _fetch_items_by_order(self, orders: list) -> list:
+        """[(order_id, items)] for orders with an ID, items fetched in batches"""
+        order_ids = [o.get("order_id") for o in orders if o.get("order_id")]
+        if not order_ids:
+            return []
+
+        size = self.ORDER_ITEMS_BATCH_SIZE
+        chunks = [order_ids[i:i + size]
+                  for i in range(0, len(order_ids), size)]
+        items_by_id = {}
+        # Chunk dijalankan bersamaan, dibatasi ORDER_ITEM_WORKERS
+        workers = min(self.ORDER_ITEM_WORKERS, len(order_ids))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch in executor.map(self._get_order_items_batch, chunks):
+                items_by_id.update(batch)
+
+            # Order yang tidak ada di hasil batch diambil satu per satu
+            missing = [o for o in order_ids if str(o) not in items_by_id]
+            for order_id, items in zip(
+                    missing, executor.map(self._get_order_items, missing)):
+                items_by_id[str(order_id)] = items
+
+        return [(order_id, items_by_id[str(order_id)])
+                for order_id in order_ids]
+
     def export_orders(self, status: str, days: int = 7) -> bool:
         """Export Lazada orders to Google Sheets with item details"""
         self._log(f"\n=== Exporting Lazada {status} Orders ===")
@@ -2100,41 +2530,30 @@ class LazadaPlatformHandler(IPlatformHandler):
                     return False
 
             worksheet = self._get_or_create_worksheet("Lazada Orders")
-            self._prepare_worksheet(worksheet)
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
             orders = self.order_manager.get_order_list(status, days)
             if not orders:
                 self._log(f"No {status} orders found")
+                self._write_export(worksheet, headers, [])
                 return False
 
             formatted_data = []
-            for order in orders:
-                order_id = order.get("order_id")
-                if not order_id:
-                    continue
-
-                items = self._get_order_items(order_id)
+            status_label = status.upper()
+            for order_id, items in self._fetch_items_by_order(orders):
                 if not items:
                     self._log(f"No items found for order {order_id}")
                     continue
 
                 order_id_str = str(order_id)
+                formatted_data.extend(
+                    _lazada_item_row(order_id_str, item, status_label)
+                    for item in items
+                )
 
-                for item in items:
-                    formatted_data.append(
-                        [
-                            order_id_str,
-                            item.get("sku", ""),
-                            item.get("name", ""),
-                            item.get("variation", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("item_price", ""),
-                            status.upper(),
-                        ]
-                    )
-
+            # Clear + header + data dalam satu request
+            self._write_export(worksheet, headers, formatted_data)
             if formatted_data:
-                worksheet.append_rows(formatted_data)
                 self._log(
                     f"✅ Successfully exported {
                         len(formatted_data)} order items"
@@ -2180,65 +2599,78 @@ class LazadaPlatformHandler(IPlatformHandler):
             skipped = 0
             failed = 0
 
-            for item in items:
+            with self._run_lock:
+                # Kumpulkan status dan log per baris, tulis sekaligus di akhir
+                self._pending_status_updates = {}
+                self._log_local.buffer = []
                 try:
-                    if not item["item_id"] or not str(item["item_id"]).strip():
-                        self._update_item_status(
-                            row=item["row"],
-                            status=f"FAILED: Invalid Product ID",
-                            sheet_name="Lazada Update",
-                        )
-                        failed += 1
-                        continue
-
-                    sku_id = item.get("model_id", "")
-                    if sku_id and not str(sku_id).strip():
-                        self._update_item_status(
-                            row=item["row"],
-                            status="FAILED: Invalid SKU ID",
-                            sheet_name="Lazada Update",
-                        )
-                        failed += 1
-                        continue
+                    for item in items:
+                        try:
+                            if not item["item_id"] or not str(item["item_id"]).strip():
+                                self._update_item_status(
+                                    row=item["row"],
+                                    status=f"FAILED: Invalid Product ID",
+                                    sheet_name="Lazada Update",
+                                )
+                                failed += 1
+                                continue
 
-                    product_info = self.product_manager.get_product_details(
-                        item["item_id"], sku_id=sku_id
-                    )
-                    if not product_info:
-                        self._update_item_status(
-                            row=item["row"],
-                            status="FAILED: Product not found",
-                            sheet_name="Lazada Update",
-                        )
-                        failed += 1
-                        continue
+                            sku_id = item.get("model_id", "")
+                            if sku_id and not str(sku_id).strip():
+                                self._update_item_status(
+                                    row=item["row"],
+                                    status="FAILED: Invalid SKU ID",
+                                    sheet_name="Lazada Update",
+                                )
+                                failed += 1
+                                continue
 
-                    model_display = f" - Model: {sku_id}" if sku_id else ""
-                    self._log(
-                        f"\nProcessing row {
-                            item['row']}: ID: {
-                            item['item_id']}{model_display}"
-                    )
-                    self._log(f"Product: {product_info['full_name']}")
+                            product_info = self.product_manager.get_product_details(
+                                item["item_id"], sku_id=sku_id
+                            )
+                            if not product_info:
+                                self._update_item_status(
+                                    row=item["row"],
+                                    status="FAILED: Product not found",
+                                    sheet_name="Lazada Update",
+                                )
+                                failed += 1
+                                continue
 
-                    result = process_function(item, product_info)
-                    if result == "processed":
-                        processed += 1
-                    elif result == "skipped":
-                        skipped += 1
-                    else:
-                        failed += 1
+                            model_display = f" - Model: {sku_id}" if sku_id else ""
+                            self._log(
+                                f"\nProcessing row {
+                                    item['row']}: ID: {
+                                    item['item_id']}{model_display}"
+                            )
+                            self._log(f"Product: {product_info['full_name']}")
+
+                            result = process_function(item, product_info)
+                            if result == "processed":
+                                processed += 1
+                            elif result == "skipped":
+                                skipped += 1
+                            elif result != "queued":
+                                failed += 1
+
+                        except Exception as e:
+                            error_msg = f"FAILED: {str(e)}"
+                            self._update_item_status(
+                                row=item["row"], status=error_msg, sheet_name="Lazada Update"
+                            )
+                            failed += 1
+                            self.logger.exception(
+                                f"Error processing row {
+                                    item['row']}"
+                            )
 
-                except Exception as e:
-                    error_msg = f"FAILED: {str(e)}"
-                    self._update_item_status(
-                        row=item["row"], status=error_msg, sheet_name="Lazada Update"
-                    )
-                    failed += 1
-                    self.logger.exception(
-                        f"Error processing row {
-                            item['row']}"
-                    )
+                    sent_ok, sent_failed = self._send_sku_updates(update_type)
+                    processed += sent_ok
+                    failed += sent_failed
+                finally:
+                    self._queued_sku_updates = []
+                    self.flush_statuses()
+                    self.flush_log()
 
             self._log(
                 f"\n{operation_name} result: {processed} processed, {skipped} skipped, {failed} failed"
@@ -2246,10 +2678,49 @@ class LazadaPlatformHandler(IPlatformHandler):
 
         except Exception as e:
             self._log(f"🔥 Error in {operation_name.lower()}: {str(e)}")
-            import traceback
-
             traceback.print_exc()
 
+    def _send_sku_updates(self, update_type: str) -> tuple[int, int]:
+        """Send queued SKU updates in batches, returns (processed, failed)"""
+        queued, self._queued_sku_updates = self._queued_sku_updates, []
+        send = (
+            self.product_manager.update_stock
+            if update_type == "stock"
+            else self.product_manager.update_price
+        )
+        processed = failed = 0
+
+        for start in range(0, len(queued), self.SKU_BATCH_SIZE):
+            chunk = queued[start:start + self.SKU_BATCH_SIZE]
+            success, response = send([payload for _, payload, _ in chunk])
+            if not success and len(chunk) > 1:
+                # Error batch tidak menyebut SKU mana yang gagal, kirim ulang
+                # satu per satu supaya status tiap baris tepat
+                results = [send([payload]) for _, payload, _ in chunk]
+            else:
+                results = [(success, response)] * len(chunk)
+
+            for (item, _, base_msg), (ok, resp) in zip(chunk, results):
+                if ok:
+                    status_msg = "SUCCESS"
+                    processed += 1
+                else:
+                    error_msg = (
+                        resp
+                        if isinstance(resp, str)
+                        else resp.get("message", "Unknown error")
+                    )
+                    status_msg = f"FAILED: {error_msg}"
+                    failed += 1
+                self._update_item_status(
+                    row=item["row"],
+                    status=status_msg,
+                    sheet_name="Lazada Update",
+                    log_msg=base_msg,
+                )
+
+        return processed, failed
+
     def process_stock_updates(self):
         """Process Lazada stock updates using common method"""
         self._process_updates(
@@ -2267,23 +2738,11 @@ class LazadaPlatformHandler(IPlatformHandler):
         )
 
     def _get_items_to_process(self, process_type: str) -> list:
-        config = {
-            "id_column": "Product ID",
-            "model_id_column": "SKU ID",
-            "check_column": "Cek",
-        }
+        if process_type not in _LAZADA_ITEMS_CONFIG:
+            return []
 
-        if process_type == "stock":
-            return self.sheet_manager.get_data(
-                "Lazada Update", {
-                    **config, "type": "stock", "value_column": "Stok"}
-            )
-        elif process_type == "price":
-            return self.sheet_manager.get_data(
-                "Lazada Update", {
-                    **config, "type": "price", "value_column": "Harga"}
-            )
-        return []
+        return self.sheet_manager.get_data(
+            "Lazada Update", _LAZADA_ITEMS_CONFIG[process_type])
 
     def _process_stock_item(self, item: dict, product_info: dict) -> str:
         """Process stock update for a single item (PERBAIKAN)"""
@@ -2302,38 +2761,17 @@ class LazadaPlatformHandler(IPlatformHandler):
                 )
                 return "skipped"
 
-            payload = [
+            # Dikirim per batch oleh _send_sku_updates
+            self._queued_sku_updates.append((
+                item,
                 {
                     "ItemId": item["item_id"],
                     "SkuId": item.get("model_id", ""),
                     "Quantity": new_qty,
-                }
-            ]
-
-            success, response = self.product_manager.update_stock(payload)
-            if success:
-                status_msg = "SUCCESS"
-                self._update_item_status(
-                    row=item["row"],
-                    status=status_msg,
-                    sheet_name="Lazada Update",
-                    log_msg=base_msg,
-                )
-                return "processed"
-            else:
-                error_msg = (
-                    response
-                    if isinstance(response, str)
-                    else response.get("message", "Unknown error")
-                )
-                status_msg = f"FAILED: {error_msg}"
-                self._update_item_status(
-                    row=item["row"],
-                    status=status_msg,
-                    sheet_name="Lazada Update",
-                    log_msg=base_msg,
-                )
-                return "failed"
+                },
+                base_msg,
+            ))
+            return "queued"
 
         except Exception as e:
             status_msg = f"FAILED: {str(e)}"
@@ -2359,39 +2797,17 @@ class LazadaPlatformHandler(IPlatformHandler):
                 )
                 return "skipped"
 
-            payload = [
+            # Dikirim per batch oleh _send_sku_updates
+            self._queued_sku_updates.append((
+                item,
                 {
                     "ItemId": item["item_id"],
                     "SkuId": item.get("model_id", ""),
                     "Price": new_price,
-                }
-            ]
-
-            success, response = self.product_manager.update_price(payload)
-
-            if success:
-                status_msg = "SUCCESS"
-                self._update_item_status(
-                    row=item["row"],
-                    status=status_msg,
-                    sheet_name="Lazada Update",
-                    log_msg=base_msg,
-                )
-                return "processed"
-            else:
-                error_msg = (
-                    response
-                    if isinstance(response, str)
-                    else response.get("message", "Unknown error")
-                )
-                status_msg = f"FAILED: {error_msg}"
-                self._update_item_status(
-                    row=item["row"],
-                    status=status_msg,
-                    sheet_name="Lazada Update",
-                    log_msg=base_msg,
-                )
-                return "failed"
+                },
+                base_msg,
+            ))
+            return "queued"
 
         except Exception as e:
             status_msg = f"FAILED: {str(e)}"
@@ -2418,7 +2834,7 @@ class LazadaPlatformHandler(IPlatformHandler):
                     return False
 
             worksheet = self._get_or_create_worksheet("Lazada Orders")
-            self._prepare_worksheet(worksheet)
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
             # Status untuk order hari ini
             statuses = [
@@ -2431,10 +2847,9 @@ class LazadaPlatformHandler(IPlatformHandler):
             ]
             all_data = []
 
-            for status in statuses:
+            # Hanya 1 hari
+            for status, orders in self._fetch_order_lists(statuses, 1):
                 self._log(f"\n🔍 Processing {status} orders...")
-                orders = self.order_manager.get_order_list(
-                    status, 1)  # Hanya 1 hari
 
                 if not orders:
                     self._log(f"No {status} orders found")
@@ -2442,29 +2857,19 @@ class LazadaPlatformHandler(IPlatformHandler):
 
                 self._log(f"Found {len(orders)} {status} orders")
 
-                for order in orders:
-                    order_id = order.get("order_id")
-                    if not order_id:
-                        continue
-
-                    items = self._get_order_items(order_id)
+                status_label = status.upper()
+                for order_id, items in self._fetch_items_by_order(orders):
                     if not items:
                         continue
 
-                    for item in items:
-                        formatted_data = [
-                            str(order_id),
-                            item.get("sku", ""),
-                            item.get("name", ""),
-                            item.get("variation", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("item_price", ""),
-                            status.upper(),
-                        ]
-                        all_data.append(formatted_data)
+                    order_id_str = str(order_id)
+                    all_data.extend(
+                        _lazada_item_row(order_id_str, item, status_label)
+                        for item in items
+                    )
 
+            self._write_export(worksheet, headers, all_data)
             if all_data:
-                worksheet.append_rows(all_data)
                 self._log(
                     f"✅ Successfully exported {
                         len(all_data)} order items"
@@ -2480,14 +2885,28 @@ class LazadaPlatformHandler(IPlatformHandler):
         finally:
             self.sheet_manager.hide_sheet("Lazada Orders")
 
+    def _get_order_list_cached(self, status, days):
+        """get_order_list, reused for ORDER_LIST_TTL seconds per access token"""
+        # Token ikut di key: setelah refresh token hasil lama tidak terpakai
+        key = (status, days, self.config.access_token)
+        cached = self._order_list_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.ORDER_LIST_TTL:
+            return cached[1]
+
+        orders = self.order_manager.get_order_list(status, days)
+        # List kosong bisa berarti error API, jangan di-cache
+        if orders:
+            self._order_list_cache[key] = (time.monotonic(), orders)
+        return orders
+
     def export_orders_by_type(self, export_type, days=7):
         """Export orders by specific type for Lazada"""
         try:
             worksheet = self._get_or_create_worksheet("Lazada Orders")
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
             if export_type == "ALL":
                 # Export all order types combined
-                self._prepare_worksheet(worksheet)
                 all_data = []
 
                 order_types = [
@@ -2502,33 +2921,22 @@ class LazadaPlatformHandler(IPlatformHandler):
                     "topack",
                     "toship",
                 ]
-                for order_type in order_types:
-                    orders = self.order_manager.get_order_list(
-                        order_type, days)
+                for order_type, orders in self._fetch_order_lists(
+                        order_types, days, fetch=self._get_order_list_cached):
                     if orders:
-                        for order in orders:
-                            order_id = order.get("order_id")
-                            if not order_id:
-                                continue
-
-                            items = self._get_order_items(order_id)
+                        status_label = order_type.upper()
+                        for order_id, items in self._fetch_items_by_order(orders):
                             if not items:
                                 continue
 
-                            for item in items:
-                                formatted_data = [
-                                    str(order_id),
-                                    item.get("sku", ""),
-                                    item.get("name", ""),
-                                    item.get("variation", ""),
-                                    int(item.get("quantity", 1)),
-                                    item.get("item_price", ""),
-                                    order_type.upper(),
-                                ]
-                                all_data.append(formatted_data)
+                            order_id_str = str(order_id)
+                            all_data.extend(
+                                _lazada_item_row(order_id_str, item, status_label)
+                                for item in items
+                            )
 
+                self._write_export(worksheet, headers, all_data)
                 if all_data:
-                    worksheet.append_rows(all_data)
                     self._log(
                         f"✅ Successfully exported {
                             len(all_data)} total order items"
@@ -2536,36 +2944,26 @@ class LazadaPlatformHandler(IPlatformHandler):
                     return True
             else:
                 # Export specific order type
-                self._prepare_worksheet(worksheet)
-                orders = self.order_manager.get_order_list(export_type, days)
+                orders = self._get_order_list_cached(export_type, days)
                 if not orders:
                     self._log(f"❌ No {export_type} orders found")
+                    self._write_export(worksheet, headers, [])
                     return False
 
                 all_data = []
-                for order in orders:
-                    order_id = order.get("order_id")
-                    if not order_id:
-                        continue
-
-                    items = self._get_order_items(order_id)
+                status_label = export_type.upper()
+                for order_id, items in self._fetch_items_by_order(orders):
                     if not items:
                         continue
 
-                    for item in items:
-                        formatted_data = [
-                            str(order_id),
-                            item.get("sku", ""),
-                            item.get("name", ""),
-                            item.get("variation", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("item_price", ""),
-                            export_type.upper(),
-                        ]
-                        all_data.append(formatted_data)
+                    order_id_str = str(order_id)
+                    all_data.extend(
+                        _lazada_item_row(order_id_str, item, status_label)
+                        for item in items
+                    )
 
+                self._write_export(worksheet, headers, all_data)
                 if all_data:
-                    worksheet.append_rows(all_data)
                     self._log(
                         f"✅ Successfully exported {
                             len(all_data)} {export_type} order items"
@@ -2584,52 +2982,6 @@ class LazadaPlatformHandler(IPlatformHandler):
         finally:
             self.sheet_manager.hide_sheet("Lazada Orders")
 
-    def process_price_updates_direct(self):
-        """Process Lazada price updates langsung tanpa sub-menu"""
-        try:
-            self._log("\n=== Processing Lazada Price Updates ===")
-
-            # Gunakan method yang sudah ada
-            result = self.process_price_updates()
-
-            if result:
-                self._log("✅ Lazada price update completed successfully")
-                return {"success": True,
-                        "message": "Lazada price updates completed"}
-            else:
-                self._log("❌ Lazada price update failed")
-                return {"success": False,
-                        "message": "Lazada price updates failed"}
-
-        except Exception as e:
-            error_msg = f"❌ Error in Lazada price update: {str(e)}"
-            self._log(error_msg)
-            return {"success": False, "message": error_msg}
-
-    # Di class TiktokPlatformHandler - tambahkan method
-
-    def process_price_updates_direct(self):
-        """Process Lazada price updates directly without submenu"""
-        try:
-            self._log("\n=== Processing Lazada Price Updates ===")
-
-            # Gunakan method yang sudah ada
-            result = self.process_price_updates()
-
-            if result:
-                self._log("✅ Lazada price update completed successfully")
-                return {"success": True,
-                        "message": "Lazada price updates completed"}
-            else:
-                self._log("❌ Lazada price update failed")
-                return {"success": False,
-                        "message": "Lazada price updates failed"}
-
-        except Exception as e:
-            error_msg = f"❌ Error in Lazada price update: {str(e)}"
-            self._log(error_msg)
-            return {"success": False, "message": error_msg}
-
     def show_export_menu(self):
         """Display Lazada export options dengan status yang diinginkan"""
         self._log("\nLazada Export Orders:")
@@ -2677,46 +3029,52 @@ class LazadaPlatformHandler(IPlatformHandler):
                     return False
 
             worksheet = self._get_or_create_worksheet("Lazada Orders")
-            self._prepare_worksheet(worksheet)
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
             # Status yang diinginkan untuk Lazada
             statuses = ["unpaid", "pending", "topack", "toship"]
             all_data = []
 
-            for status in statuses:
+            orders_by_status = []
+            for status, orders in self._fetch_order_lists(statuses, 7):
                 self._log(f"\n🔍 Processing {status} orders...")
-                orders = self.order_manager.get_order_list(status, 7)
 
                 if not orders:
                     self._log(f"No {status} orders found")
                     continue
 
                 self._log(f"Found {len(orders)} {status} orders")
+                orders_by_status.append((status, orders))
+
+            # Item semua status diambil sekaligus supaya batch terisi penuh;
+            # order yang muncul di beberapa status hanya diminta sekali
+            unique_orders = {
+                order.get("order_id"): order
+                for _, orders in orders_by_status for order in orders
+            }
+            items_by_id = dict(
+                self._fetch_items_by_order(list(unique_orders.values())))
 
+            for status, orders in orders_by_status:
+                status_label = status.upper()
                 for order in orders:
                     order_id = order.get("order_id")
                     if not order_id:
                         continue
 
-                    items = self._get_order_items(order_id)
+                    items = items_by_id.get(order_id)
                     if not items:
                         self._log(f"No items found for order {order_id}")
                         continue
 
-                    for item in items:
-                        formatted_data = [
-                            str(order_id),
-                            item.get("sku", ""),
-                            item.get("name", ""),
-                            item.get("variation", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("item_price", ""),
-                            status.upper(),
-                        ]
-                        all_data.append(formatted_data)
+                    order_id_str = str(order_id)
+                    all_data.extend(
+                        _lazada_item_row(order_id_str, item, status_label)
+                        for item in items
+                    )
 
+            self._write_export(worksheet, headers, all_data)
             if all_data:
-                worksheet.append_rows(all_data)
                 self._log(
                     f"✅ Successfully exported {
                         len(all_data)} order items")
@@ -2770,8 +3128,7 @@ class LazadaPlatformHandler(IPlatformHandler):
                 all_orders = []
                 statuses = self._get_order_statuses_for_platform()
 
-                for status in statuses:
-                    orders = self.order_manager.get_order_list(status, days)
+                for _, orders in self._fetch_order_lists(statuses, days):
                     all_orders.extend(orders)
 
                 if not all_orders:
@@ -2830,7 +3187,6 @@ class LazadaPlatformHandler(IPlatformHandler):
         except Exception as e:
             self.logger.error(
                 f"❌ Error exporting orders to Google Sheets: {str(e)}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
 
@@ -2900,8 +3256,7 @@ class TiktokPlatformHandler(IPlatformHandler):
 
             try:
                 if self.api.refresh_access_token():
-                    expiry_time = self.config.token_expiry.strftime(
-                        "%Y-%m-%d %H:%M:%S")
+                    expiry_time = self.config.expiry_str
                     self._log(
                         f"🔃 {
                             self.platform_name} token refreshed successfully!"
@@ -2922,8 +3277,7 @@ class TiktokPlatformHandler(IPlatformHandler):
                 )
                 return False
         else:
-            expiry_time = self.config.token_expiry.strftime(
-                "%Y-%m-%d %H:%M:%S")
+            expiry_time = self.config.expiry_str
             self._log(
                 f"✅ {
                     self.platform_name} token is valid until {expiry_time}"
@@ -2994,35 +3348,29 @@ class TiktokPlatformHandler(IPlatformHandler):
         for order in orders:
             order_id = order.get("id", "")
             order_status = order.get("status", default_status)
-            sku_details = {}
-
-            for item in order.get("line_items", []):
-                sku = item.get("seller_sku", "")
-                qty = int(item.get("quantity", 1))
-                original_price = item.get("original_price", "")
-
-                if sku not in sku_details:
-                    sku_details[sku] = {
-                        "name": item.get("product_name", ""),
-                        "variant": item.get("sku_name", ""),
-                        "qty": 0,
-                        "original_price": original_price,
-                        "status": order_status,
-                    }
-                sku_details[sku]["qty"] += qty
+            # {sku: baris export}, qty dijumlahkan langsung di kolom ke-5
+            rows_by_sku = {}
+
+            for item in order.get("line_items", ()):
+                get = item.get
+                sku = get("seller_sku", "")
+                qty = int(get("quantity", 1))
 
-            for sku, details in sku_details.items():
-                formatted_data.append(
-                    [
+                row = rows_by_sku.get(sku)
+                if row is None:
+                    rows_by_sku[sku] = [
                         order_id,
                         sku,
-                        details["name"],
-                        details["variant"],
-                        details["qty"],
-                        details["original_price"],
-                        details["status"],
+                        get("product_name", ""),
+                        get("sku_name", ""),
+                        qty,
+                        get("original_price", ""),
+                        order_status,
                     ]
-                )
+                else:
+                    row[4] += qty
+
+            formatted_data.extend(rows_by_sku.values())
 
         return formatted_data
 
@@ -3285,8 +3633,7 @@ class TiktokPlatformHandler(IPlatformHandler):
 
             if export_type == "ALL":
                 # Export all order types combined
-                self._prepare_worksheet(worksheet)
-                all_data = []
+                headers = list(self.DEFAULT_EXPORT_HEADERS)
 
                 order_types = [
                     "UNPAID",
@@ -3296,30 +3643,17 @@ class TiktokPlatformHandler(IPlatformHandler):
                     "COMPLETED",
                     "CANCELLED",
                 ]
-                for order_type in order_types:
-                    orders = self.order_manager.get_order_list(
-                        order_type, days)
-                    if orders:
-                        for order in orders:
-                            order_id = order.get("id", "")
-                            if not order_id:
-                                continue
-
-                            line_items = order.get("line_items", [])
-                            for item in line_items:
-                                formatted_data = [
-                                    order_id,
-                                    item.get("seller_sku", ""),
-                                    item.get("product_name", ""),
-                                    item.get("sku_name", ""),
-                                    int(item.get("quantity", 1)),
-                                    item.get("original_price", ""),
-                                    order_type,
-                                ]
-                                all_data.append(formatted_data)
+                all_data = [
+                    _tiktok_item_row(order["id"], item, order_type)
+                    for order_type, orders in self._fetch_order_lists(
+                        order_types, days)
+                    for order in orders or ()
+                    if order.get("id")
+                    for item in order.get("line_items", [])
+                ]
 
+                self._write_export(worksheet, headers, all_data)
                 if all_data:
-                    worksheet.append_rows(all_data)
                     self._log(
                         f"✅ Successfully exported {
                             len(all_data)} total order items"
@@ -3327,33 +3661,22 @@ class TiktokPlatformHandler(IPlatformHandler):
                     return True
             else:
                 # Export specific order type
-                self._prepare_worksheet(worksheet)
+                headers = list(self.DEFAULT_EXPORT_HEADERS)
                 orders = self.order_manager.get_order_list(export_type, days)
                 if not orders:
                     self._log(f"❌ No {export_type} orders found")
+                    self._write_export(worksheet, headers, [])
                     return False
 
-                all_data = []
-                for order in orders:
-                    order_id = order.get("id", "")
-                    if not order_id:
-                        continue
-
-                    line_items = order.get("line_items", [])
-                    for item in line_items:
-                        formatted_data = [
-                            order_id,
-                            item.get("seller_sku", ""),
-                            item.get("product_name", ""),
-                            item.get("sku_name", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("original_price", ""),
-                            export_type,
-                        ]
-                        all_data.append(formatted_data)
+                all_data = [
+                    _tiktok_item_row(order["id"], item, export_type)
+                    for order in orders
+                    if order.get("id")
+                    for item in order.get("line_items", [])
+                ]
 
+                self._write_export(worksheet, headers, all_data)
                 if all_data:
-                    worksheet.append_rows(all_data)
                     self._log(
                         f"✅ Successfully exported {
                             len(all_data)} {export_type} order items"
@@ -3372,50 +3695,6 @@ class TiktokPlatformHandler(IPlatformHandler):
         finally:
             self.sheet_manager.hide_sheet("Tiktok Orders")
 
-    def process_price_updates_direct(self):
-        """Process Tiktok price updates langsung tanpa sub-menu"""
-        try:
-            self._log("\n=== Processing Tiktok Price Updates ===")
-
-            # Gunakan method yang sudah ada
-            result = self.process_price_updates()
-
-            if result:
-                self._log("✅ Tiktok price update completed successfully")
-                return {"success": True,
-                        "message": "Tiktok price updates completed"}
-            else:
-                self._log("❌ Tiktok price update failed")
-                return {"success": False,
-                        "message": "Tiktok price updates failed"}
-
-        except Exception as e:
-            error_msg = f"❌ Error in Tiktok price update: {str(e)}"
-            self._log(error_msg)
-            return {"success": False, "message": error_msg}
-
-    def process_price_updates_direct(self):
-        """Process Tiktok price updates directly without submenu"""
-        try:
-            self._log("\n=== Processing Tiktok Price Updates ===")
-
-            # Gunakan method yang sudah ada
-            result = self.process_price_updates()
-
-            if result:
-                self._log("✅ Tiktok price update completed successfully")
-                return {"success": True,
-                        "message": "Tiktok price updates completed"}
-            else:
-                self._log("❌ Tiktok price update failed")
-                return {"success": False,
-                        "message": "Tiktok price updates failed"}
-
-        except Exception as e:
-            error_msg = f"❌ Error in Tiktok price update: {str(e)}"
-            self._log(error_msg)
-            return {"success": False, "message": error_msg}
-
     def show_export_menu(self):
         """Display Tiktok export options dengan status yang diinginkan"""
         self._log("\nTiktok Export Orders:")
@@ -3461,12 +3740,11 @@ class TiktokPlatformHandler(IPlatformHandler):
         """Helper function untuk export orders multiple statuses"""
         try:
             worksheet = self._get_or_create_worksheet("Tiktok Orders")
-            self._prepare_worksheet(worksheet)
+            headers = list(self.DEFAULT_EXPORT_HEADERS)
 
             all_data = []
-            for status in statuses:
+            for status, orders in self._fetch_order_lists(statuses, days):
                 self._log(f"\n🔍 Processing {status} orders...")
-                orders = self.order_manager.get_order_list(status, days)
 
                 if not orders:
                     self._log(f"No {status} orders found")
@@ -3484,23 +3762,16 @@ class TiktokPlatformHandler(IPlatformHandler):
                         self._log(f"No line items found for order {order_id}")
                         continue
 
-                    for item in line_items:
-                        formatted_data = [
-                            order_id,
-                            item.get("seller_sku", ""),
-                            item.get("product_name", ""),
-                            item.get("sku_name", ""),
-                            int(item.get("quantity", 1)),
-                            item.get("original_price", ""),
-                            status,
-                        ]
-                        all_data.append(formatted_data)
+                    all_data.extend(
+                        _tiktok_item_row(order_id, item, status)
+                        for item in line_items
+                    )
 
+            self._write_export(worksheet, headers, all_data)
             if not all_data:
                 self._log("No orders found to export")
                 return False
 
-            worksheet.append_rows(all_data)
             self._log(f"✅ Successfully exported {len(all_data)} order items")
             return True
 
@@ -3549,8 +3820,7 @@ class TiktokPlatformHandler(IPlatformHandler):
                 all_orders = []
                 statuses = self._get_order_statuses_for_platform()
 
-                for status in statuses:
-                    orders = self.order_manager.get_order_list(status, days)
+                for _, orders in self._fetch_order_lists(statuses, days):
                     all_orders.extend(orders)
 
                 if not all_orders:
@@ -3609,7 +3879,6 @@ class TiktokPlatformHandler(IPlatformHandler):
         except Exception as e:
             self.logger.error(
                 f"❌ Error exporting orders to Google Sheets: {str(e)}")
-            import traceback
             self.logger.error(traceback.format_exc())
             return False
 
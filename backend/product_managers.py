@@ -141,6 +141,12 @@ class ShopeeProductManager(BaseProductManager):
             and response["response"]["item_list"]
         )
 
+    def product_info_from_base(self, item_data):
+        """get_product_details result (no model) from a fetched base info item"""
+        product_info = self._get_base_product_info(item_data)
+        self._fill_non_variation_product_info(item_data, product_info)
+        return product_info
+
     def _fill_non_variation_product_info(self, item_data, product_info):
         """Fill product info for non-variation products"""
         if "price_info" in item_data and item_data["price_info"]:
@@ -9,6 +9,9 @@ from google.oauth2.service_account import \
     Credentials as ServiceAccountCredentials
 from oauth2client.service_account import ServiceAccountCredentials
 
+# Nilai kolom "Cek" yang dianggap dicentang
+CHECK_TRUTHY_VALUES = frozenset({"TRUE", "1", "YES", "Y", "X"})
+
 
 class ISheetManager(ABC):
     """Abstract base class for sheet managers"""
@@ -21,6 +24,10 @@ class ISheetManager(ABC):
     def update_status(self, row, status, sheet_name):
         pass
 
+    @abstractmethod
+    def update_statuses(self, updates, sheet_name):
+        pass
+
     @abstractmethod
     def hide_sheet(self, sheet_name):
         pass
@@ -38,6 +45,8 @@ class GSheetManager(ISheetManager):
         self.max_delay = 60
         self.retry_count = 0
         self.logger = logging.getLogger(__name__)
+        # {(sheet_name, header_lower): column index}
+        self._header_index_cache = {}
 
     def _switch_account(self):
         self.current_account_index = (self.current_account_index + 1) % len(
@@ -86,8 +95,8 @@ class GSheetManager(ISheetManager):
                     sheet_name = "Update Sheet"
 
                 worksheet = self._get_worksheet(sheet_name)
-                status_col = self._get_column_index_by_header(
-                    worksheet, "Status")
+                status_col = self.get_header_index(
+                    sheet_name, "Status", worksheet)
 
                 worksheet.update_cell(row, status_col, status)
                 print(f"✅ Updated status: '{status}' at row {row}")
@@ -132,6 +141,42 @@ class GSheetManager(ISheetManager):
         print(f"❌ Permanent failure after {max_retries} attempts")
         return False
 
+    def update_statuses(self, updates, sheet_name):
+        """Write a list of (row, status) pairs with one batch_update call"""
+        if not updates:
+            return True
+
+        if not isinstance(sheet_name, str) or len(sheet_name) > 50:
+            sheet_name = "Update Sheet"
+
+        try:
+            self._rate_limit()
+            worksheet = self._get_worksheet(sheet_name)
+            status_col = self.get_header_index(sheet_name, "Status", worksheet)
+
+            worksheet.batch_update(
+                [
+                    {
+                        "range": gspread.utils.rowcol_to_a1(row, status_col),
+                        "values": [[status]],
+                    }
+                    for row, status in updates
+                ],
+                value_input_option="USER_ENTERED",
+            )
+            print(f"✅ Updated {len(updates)} statuses in '{sheet_name}'")
+            self.retry_count = 0
+            return True
+
+        except Exception as e:
+            # Fallback ke update per baris yang punya retry/switch account
+            print(f"⚠️ Batch status update failed: {str(e)}")
+            results = [
+                self.update_status(row, status, sheet_name)
+                for row, status in updates
+            ]
+            return all(results)
+
     def print_headers(self, sheet_name):
         try:
             worksheet = self._get_worksheet(sheet_name)
@@ -146,13 +191,22 @@ class GSheetManager(ISheetManager):
         return self.sheet.worksheet(sheet_name)
 
     def _should_process_record(self, record, check_column):
-        if check_column not in record:
-            return False
+        cek_value = record.get(check_column)
+        return cek_value is True or (
+            cek_value is not None
+            and cek_value is not False
+            and str(cek_value).strip().upper() in CHECK_TRUTHY_VALUES
+        )
 
-        cek_value = record[check_column]
-        if isinstance(cek_value, bool) and cek_value:
-            return True
-        return str(cek_value).strip().upper() in ["TRUE", "1", "YES", "Y", "X"]
+    def get_header_index(self, sheet_name, header_name, worksheet=None):
+        """Column index of header_name, read from row 1 once per get_data run"""
+        key = (sheet_name, header_name.lower())
+        if key not in self._header_index_cache:
+            if worksheet is None:
+                worksheet = self._get_worksheet(sheet_name)
+            self._header_index_cache[key] = self._get_column_index_by_header(
+                worksheet, header_name)
+        return self._header_index_cache[key]
 
     def _get_column_index_by_header(self, worksheet, header_name):
         headers = worksheet.row_values(1)
@@ -177,6 +231,12 @@ class GSheetManager(ISheetManager):
             ]
         }
         """
+        # Run baru: kolom bisa sudah dipindah user, baca ulang index header
+        self._header_index_cache = {
+            key: idx for key, idx in self._header_index_cache.items()
+            if key[0] != sheet_name
+        }
+
         try:
             worksheet = self._get_worksheet(sheet_name)
             records = worksheet.get_all_records()
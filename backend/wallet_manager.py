@@ -163,6 +163,12 @@ class ShopeeWalletManager(IWalletManager):
             self.logger.error(f"Error exporting to CSV: {str(e)}")
             return False
 
+    def get_order_numbers(self, transactions):
+        """Unique order numbers from raw transactions, in first-seen order"""
+        return list(dict.fromkeys(
+            tx["order_sn"] for tx in transactions if tx.get("order_sn")
+        ))
+
     def export_order_numbers_to_file(self, transactions, month, year):
         """Export order numbers to text file dengan logging detail"""
         try: